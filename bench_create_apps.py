@@ -0,0 +1,125 @@
+"""
+Provisioning benchmark: runs AppProvisioner (the create_apps tool) against
+fake_livingapps.py and reports wall time and request counts per schema size.
+
+    python bench_create_apps.py                       # 5 / 50 / 500 apps, 50 ms latency
+    python bench_create_apps.py --sizes 50 --latency 0.2 --rate-limit-rate 0.05
+    python bench_create_apps.py --sizes 500 --max-rps 40 --rate 30
+    python bench_create_apps.py --cycles --json
+"""
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from fake_livingapps import FakeLivingApps, serve
+from livingapps_provisioner import AppProvisioner, ProvisioningError, sort_apps_by_dependencies
+from request_scheduler import RequestScheduler
+
+
+def synthetic_apps(n: int, lookups_per_app: int = 2, cycles: bool = False, seed: int = 0) -> list:
+    """``n`` app definitions in create_apps format with random applookup references.
+
+    Without ``cycles`` every app only references apps before it (a DAG),
+    otherwise references may point anywhere (two-phase creation).
+    """
+    rnd = random.Random(seed)
+    apps = []
+    for i in range(n):
+        controls = {
+            "name": {"fulltype": "string/text", "label": "Name", "required": True, "in_list": True},
+            "beschreibung": {"fulltype": "string/textarea", "label": "Beschreibung"},
+            "anzahl": {"fulltype": "number", "label": "Anzahl"},
+            "status": {"fulltype": "lookup/select", "label": "Status",
+                       "lookups": [{"key": "offen", "value": "Offen"}, {"key": "erledigt", "value": "Erledigt"}]},
+        }
+        candidates = range(n) if cycles else range(i)
+        for ref in rnd.sample(candidates, min(lookups_per_app, len(candidates))):
+            controls[f"ref_{ref}"] = {"fulltype": "applookup/select", "label": f"App {ref}", "lookup_app_ref": f"app_{ref}"}
+        apps.append({"name": f"App {i}", "identifier": f"app_{i}", "controls": controls})
+    return apps
+
+
+async def run_once(base_url: str, apps: list, concurrency: int, two_phase: bool, rate: float = None) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        async with httpx.AsyncClient(
+            headers={"X-API-Key": "bench", "Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        ) as client:
+            scheduler = RequestScheduler(client, rate=rate, burst=int(rate or 1) * 2, max_concurrency=concurrency)
+            provisioner = AppProvisioner(
+                scheduler,
+                api_url=f"{base_url}/rest",
+                metadata_path=Path(tmp) / "app_metadata.json",
+                journal_path=Path(tmp) / "app_metadata.journal.jsonl",
+                max_concurrency=concurrency,
+            )
+            t_start = time.perf_counter()
+            try:
+                await provisioner.create_apps(apps, two_phase=two_phase)
+                error = None
+            except ProvisioningError as e:
+                error = str(e)
+            return {"wall_s": time.perf_counter() - t_start, "error": error, "retries": scheduler.retries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark create_apps against the local LivingApps fake")
+    parser.add_argument("--sizes", default="5,50,500", help="Comma separated app counts")
+    parser.add_argument("--lookups-per-app", type=int, default=2)
+    parser.add_argument("--cycles", action="store_true", help="Allow cyclic applookup references")
+    parser.add_argument("--two-phase", action="store_true", help="Force two-phase creation")
+    parser.add_argument("--concurrency", type=int, default=8, help="LIVINGAPPS_MAX_CONCURRENCY")
+    parser.add_argument("--rate", type=float, default=None, help="Client-side rate limit (requests/s), default unlimited")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args()
+
+    fake = FakeLivingApps(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, max_rps=args.max_rps, seed=args.seed,
+    )
+    server = serve(fake)
+    base_url = "http://{}:{}".format(*server.server_address[:2])
+
+    if not args.json:
+        print(f"{'apps':>6} {'levels':>6} {'requests':>9} {'429':>5} {'5xx':>5} {'retries':>7} {'wall s':>8} {'apps/s':>8}  status")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        apps = synthetic_apps(size, args.lookups_per_app, args.cycles, args.seed)
+        levels, cyclic, _ = sort_apps_by_dependencies(apps)
+        fake.reset()
+        result = asyncio.run(run_once(base_url, apps, args.concurrency, args.two_phase, args.rate))
+        stats = fake.stats()
+        row = {
+            "apps": size,
+            "levels": 1 if (cyclic or args.two_phase) else len(levels),
+            "requests": stats["requests"],
+            "by_route": stats["by_route"],
+            "status_429": stats["by_status"].get("429", 0),
+            "status_5xx": sum(v for k, v in stats["by_status"].items() if k.startswith("5")),
+            "retries": result["retries"],
+            "wall_s": round(result["wall_s"], 3),
+            "error": result["error"],
+        }
+        if args.json:
+            print(json.dumps(row), flush=True)
+        else:
+            status = "ok" if not row["error"] else f"FAILED: {row['error'][:60]}"
+            print(f"{size:>6} {row['levels']:>6} {row['requests']:>9} {row['status_429']:>5} {row['status_5xx']:>5} {row['retries']:>7} "
+                  f"{row['wall_s']:>8.2f} {size / row['wall_s']:>8.1f}  {status}", flush=True)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Benchmark and scaling check of the code generators on synthetic schemas:
+the SchemaIndex build, TypeScriptGenerator.generate_types / generate_service
+and ReactComponentGenerator.generate_all (all apps as CRUD scaffolds), and
+the streaming iter_files of both.
+
+The schemas use the app_metadata.json format: N apps x M controls over all
+fulltypes plus a dense applookup graph. Reported per entity (= app): time
+(best of --repeat), peak memory (tracemalloc, separate run) and emitted bytes.
+
+Exits with 1 when a budget is exceeded or a per-entity value grows more than
+--max-growth from the smallest to the largest size (not linear anymore).
+Budgets apply to M = DEFAULT_CONTROLS and scale linearly with --controls.
+
+    python bench_generators.py                          # 20 / 80 / 320 apps x 12 controls
+    python bench_generators.py --sizes 50,500 --controls 30 --lookups-per-app 6
+    python bench_generators.py --json
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from react_component_generator import ReactComponentGenerator
+from schema_index import SchemaIndex
+from typescript_generator import TypeScriptGenerator
+
+API_URL = "https://my.living-apps.de/rest"
+
+FULLTYPES = [
+    "string/text", "string/email", "string/textarea", "number", "bool",
+    "date/date", "date/datetimeminute", "lookup/select", "applookup/select",
+]
+
+NAMES = ["kunden", "produkte", "bestellungen", "teilnehmer", "kurse", "räume",
+         "mitarbeiter", "veranstaltungen", "kategorien", "rechnungen", "fahrzeuge", "buchungen"]
+
+DEFAULT_CONTROLS = 12
+
+# Growth checks need totals above timer noise / allocator granularity at the smallest size
+GROWTH_FLOOR = {"ms": 1.0, "bytes": 1, "peak_kib": 64}
+
+# Per entity, for DEFAULT_CONTROLS controls and the default lookups per app
+BUDGETS = {
+    "index": {"ms": 0.1, "bytes": 0, "peak_kib": 16},
+    "types": {"ms": 0.06, "bytes": 1_200, "peak_kib": 8},
+    "service": {"ms": 0.03, "bytes": 1_300, "peak_kib": 8},
+    "components": {"ms": 1.0, "bytes": 24_000, "peak_kib": 96},
+    "stream": {"ms": 1.1, "bytes": 26_000, "peak_kib": 40},
+}
+
+
+def synthetic_metadata(n_apps: int, n_controls: int = DEFAULT_CONTROLS, lookups_per_app: int = 4, seed: int = 0) -> dict:
+    """app_metadata.json content with ``n_apps`` apps of ``n_controls`` controls each.
+
+    Controls cycle through FULLTYPES; every app additionally gets
+    ``lookups_per_app`` applookups to random other apps (back references
+    included, the generators have to cope with cycles).
+    """
+    rnd = random.Random(seed)
+    identifiers = [NAMES[i % len(NAMES)] + (f"_{i}" if i >= len(NAMES) else "") for i in range(n_apps)]
+    app_ids = [f"{i:024x}" for i in range(n_apps)]
+
+    def control(identifier: str, label: str, fulltype: str, number: int) -> dict:
+        type_, _, subtype = fulltype.partition("/")
+        return {
+            "identifier": identifier, "label": label, "type": type_, "subtype": subtype or None,
+            "fulltype": fulltype, "description": f"{label} ({fulltype})",
+            "required": number == 0, "in_list": number % 2 == 0, "in_mobile_list": number % 2 == 0,
+            "in_text": False, "in_structured_search": False, "in_fulltext_search": True, "in_expert_search": True,
+        }
+
+    apps = {}
+    for i, identifier in enumerate(identifiers):
+        controls = {}
+        for j in range(n_controls):
+            fulltype = FULLTYPES[j % len(FULLTYPES)]
+            key = f"{fulltype.split('/')[0]}_{j}"
+            ctrl = control(key, f"Feld {j}", fulltype, j)
+            if fulltype == "lookup/select":
+                ctrl["lookup_data"] = {f"option_{k}": f"Option {k}" for k in range(5)}
+            elif fulltype == "applookup/select":
+                ctrl["lookup_app"] = f"{API_URL}/apps/{app_ids[rnd.randrange(n_apps)]}"
+            controls[key] = ctrl
+        for ref in rnd.sample(range(n_apps), min(lookups_per_app, n_apps)):
+            key = f"ref_{identifiers[ref]}"
+            controls[key] = control(key, identifiers[ref].title(), "applookup/select", len(controls))
+            controls[key]["lookup_app"] = f"{API_URL}/apps/{app_ids[ref]}"
+        apps[identifier] = {"app_id": app_ids[i], "name": identifier.title(), "controls": controls}
+
+    return {
+        "appgroup_id": None,
+        "appgroup_name": "Benchmark",
+        "apps": apps,
+        "metadata": {"apps_list": [app["name"] for app in apps.values()]},
+    }
+
+
+def emitted_bytes(output) -> int:
+    if isinstance(output, int):
+        return output
+    if isinstance(output, dict):
+        return sum(len(content.encode("utf-8")) for content in output.values())
+    return len(output.encode("utf-8"))
+
+
+def build_index(metadata: dict, index: SchemaIndex) -> int:
+    SchemaIndex(metadata)
+    return 0
+
+
+# Like generate_typescript, all generators share one SchemaIndex per schema
+GENERATORS = {
+    "index": build_index,
+    "types": lambda metadata, index: TypeScriptGenerator(metadata, index).generate_types(),
+    "service": lambda metadata, index: TypeScriptGenerator(metadata, index).generate_service(),
+    "components": lambda metadata, index: ReactComponentGenerator(metadata, list(metadata["apps"]), index).generate_all(),
+    # iter_files consumed chunk by chunk (as write_stream does), output is only counted
+    "stream": lambda metadata, index: sum(
+        len(chunk.encode("utf-8"))
+        for generator in (TypeScriptGenerator(metadata, index), ReactComponentGenerator(metadata, list(metadata["apps"]), index))
+        for _, chunk in generator.iter_files()
+    ),
+}
+
+
+def measure(generate, metadata: dict, index: SchemaIndex, repeat: int) -> dict:
+    timings = []
+    # Like timeit: no GC pauses in the timed runs
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t_start = time.perf_counter()
+            output = generate(metadata, index)
+            timings.append(time.perf_counter() - t_start)
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    generate(metadata, index)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": min(timings) * 1000, "bytes": emitted_bytes(output), "peak_kib": peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and scaling check of the TypeScript/React generators")
+    parser.add_argument("--sizes", default="20,80,320", help="Comma separated app counts")
+    parser.add_argument("--controls", type=int, default=DEFAULT_CONTROLS, help="Controls per app (without the extra applookups)")
+    parser.add_argument("--lookups-per-app", type=int, default=4, help="Additional applookups per app")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-growth", type=float, default=2.0,
+                        help="Allowed growth of per-entity time/bytes/memory from the smallest to the largest size")
+    parser.add_argument("--budget-factor", type=float, default=1.0, help="Multiplies all budgets (slow CI machines)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args()
+
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    scale = args.budget_factor * max(1.0, args.controls / DEFAULT_CONTROLS)
+    failures = []
+    results = {name: {} for name in GENERATORS}
+
+    if not args.json:
+        print(f"{'generator':<11} {'apps':>5} {'ms':>9} {'ms/app':>8} {'KiB':>9} {'B/app':>8} {'peak KiB':>9} {'peak/app':>9}")
+    for size in sizes:
+        metadata = synthetic_metadata(size, args.controls, args.lookups_per_app, seed=args.seed)
+        index = SchemaIndex(metadata)
+        for name, generate in GENERATORS.items():
+            total = measure(generate, metadata, index, args.repeat)
+            per_entity = {metric: value / size for metric, value in total.items()}
+            results[name][size] = per_entity
+
+            for metric, budget in BUDGETS[name].items():
+                if per_entity[metric] > budget * scale:
+                    failures.append(f"{name} @ {size} apps: {metric}/app {per_entity[metric]:.3f} > budget {budget * scale:.3f}")
+
+            if args.json:
+                print(json.dumps({"generator": name, "apps": size, "controls": args.controls,
+                                  **{metric: round(value, 3) for metric, value in total.items()},
+                                  **{f"{metric}_per_app": round(value, 4) for metric, value in per_entity.items()}}), flush=True)
+            else:
+                print(f"{name:<11} {size:>5} {total['ms']:>9.2f} {per_entity['ms']:>8.3f} {total['bytes'] / 1024:>9.1f} "
+                      f"{per_entity['bytes']:>8.0f} {total['peak_kib']:>9.1f} {per_entity['peak_kib']:>9.2f}", flush=True)
+
+    if len(sizes) > 1:
+        smallest, largest = sizes[0], sizes[-1]
+        for name, by_size in results.items():
+            for metric in ("ms", "bytes", "peak_kib"):
+                if by_size[smallest][metric] * smallest < GROWTH_FLOOR[metric]:
+                    continue
+                growth = by_size[largest][metric] / max(by_size[smallest][metric], 1e-9)
+                if growth > args.max_growth:
+                    failures.append(f"{name}: {metric}/app grows x{growth:.2f} from {smallest} to {largest} apps "
+                                    f"(max x{args.max_growth})")
+
+    for failure in failures:
+        print(f"[BENCH] ❌ {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+    if not args.json:
+        print("[BENCH] ✅ Within budgets, per-entity cost linear")
+
+
+if __name__ == "__main__":
+    main()
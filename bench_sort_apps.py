@@ -0,0 +1,103 @@
+"""
+Benchmark of sort_apps_by_dependencies on synthetic schemas with thousands of apps.
+
+Compares against the previous frontier scan (O(V²), only up to --reference-max
+apps) and checks that both produce the same levels.
+
+    python bench_sort_apps.py                          # 1000 / 5000 / 20000 apps
+    python bench_sort_apps.py --sizes 2000 --lookups-per-app 5 --cycles 3
+"""
+import argparse
+import json
+import random
+import time
+
+from bench_create_apps import synthetic_apps
+from livingapps_provisioner import sort_apps_by_dependencies
+
+
+def reference_sort(apps):
+    """The previous implementation: scans every app's dependencies per processed app."""
+    dependencies = {app["identifier"]: set() for app in apps}
+    app_map = {app["identifier"]: app for app in apps}
+    for app in apps:
+        for ctrl in app.get("controls", {}).values():
+            ref = ctrl.get("lookup_app_ref")
+            if "applookup" in ctrl.get("fulltype", "") and ref in app_map:
+                dependencies[app["identifier"]].add(ref)
+
+    levels = []
+    in_degree = {app_id: len(deps) for app_id, deps in dependencies.items()}
+    frontier = [app_id for app_id, degree in in_degree.items() if degree == 0]
+    while frontier:
+        levels.append([app_map[app_id] for app_id in frontier])
+        next_frontier = []
+        for current in frontier:
+            for app_id, deps in dependencies.items():
+                if current in deps:
+                    in_degree[app_id] -= 1
+                    if in_degree[app_id] == 0:
+                        next_frontier.append(app_id)
+        frontier = next_frontier
+    return levels
+
+
+def add_cycles(apps, count: int, seed: int):
+    """Close ``count`` random back references (app_i -> app_j with j > i)."""
+    rnd = random.Random(seed)
+    for n in range(count):
+        i, j = sorted(rnd.sample(range(len(apps)), 2))
+        apps[i]["controls"][f"cycle_{n}"] = {
+            "fulltype": "applookup/select", "label": "Cycle", "lookup_app_ref": apps[j]["identifier"],
+        }
+
+
+def level_sets(levels):
+    return [sorted(app["identifier"] for app in level) for level in levels]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the applookup dependency sorter")
+    parser.add_argument("--sizes", default="1000,5000,20000", help="Comma separated app counts")
+    parser.add_argument("--lookups-per-app", type=int, default=3)
+    parser.add_argument("--cycles", type=int, default=0, help="Number of back references creating cycles")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--reference-max", type=int, default=5000, help="Largest size timed with the O(V²) reference")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args()
+
+    if not args.json:
+        print(f"{'apps':>7} {'edges':>8} {'levels':>6} {'cyclic':>6} {'cycles':>6} {'sort ms':>9} {'ref ms':>9}  check")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        apps = synthetic_apps(size, args.lookups_per_app, seed=args.seed)
+        add_cycles(apps, args.cycles, args.seed)
+        edges = sum(1 for app in apps for ctrl in app["controls"].values() if "lookup_app_ref" in ctrl)
+
+        timings = []
+        for _ in range(args.repeat):
+            t_start = time.perf_counter()
+            levels, cyclic, cycles = sort_apps_by_dependencies(apps)
+            timings.append(time.perf_counter() - t_start)
+
+        row = {
+            "apps": size, "edges": edges, "levels": len(levels), "cyclic": len(cyclic),
+            "cycles": [len(cycle) for cycle in cycles], "sort_ms": round(min(timings) * 1000, 2),
+            "reference_ms": None, "check": "skipped",
+        }
+        if size <= args.reference_max:
+            t_start = time.perf_counter()
+            reference = reference_sort(apps)
+            row["reference_ms"] = round((time.perf_counter() - t_start) * 1000, 2)
+            row["check"] = "ok" if level_sets(reference) == level_sets(levels) else "MISMATCH"
+
+        if args.json:
+            print(json.dumps(row), flush=True)
+        else:
+            reference_ms = f"{row['reference_ms']:>9.1f}" if row["reference_ms"] is not None else f"{'-':>9}"
+            print(f"{size:>7} {edges:>8} {row['levels']:>6} {row['cyclic']:>6} {len(cycles):>6} "
+                  f"{row['sort_ms']:>9.1f} {reference_ms}  {row['check']}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Local stand-in for the LivingApps REST endpoints used by claude_agent.py.
+
+Serves (below /rest):
+- POST   /apps                          — create app
+- GET    /apps/{id}, PATCH /apps/{id}   — read app / add or change controls
+- PUT    /apps/{id}/params/{name}       — set app parameter (dashboard links)
+- GET    /appgroups/{id}                — appgroup with all apps
+- GET/POST /apps/{id}/records, GET/PATCH/DELETE /apps/{id}/records/{rid}
+plus GET /github/{appgroup_id}/ (deployed dashboard, with ETag / If-None-Match and
+the build fingerprint set via ``publish_dashboard``), POST /_publish and GET /_stats.
+
+Latency, error rate and 429 responses are configurable, so create_apps and
+deploy_to_github can be exercised and benchmarked without my.living-apps.de:
+
+    python fake_livingapps.py --port 8765 --latency 0.2 --rate-limit-rate 0.05
+    LIVINGAPPS_API_URL=http://127.0.0.1:8765/rest \\
+    LIVINGAPPS_DASHBOARD_URL=http://127.0.0.1:8765/github python claude_agent.py
+
+In that setup the fake doesn't see the push. Either publish the deployed
+build explicitly (e.g. from a post-receive hook of a local GIT_PUSH_URL):
+
+    curl -X POST http://127.0.0.1:8765/_publish -d '{"fingerprint": "<commit sha>", "delay": 5}'
+
+or start it with ``--auto-publish 5``: every dashboard request without a
+pending build starts one that goes live 5 s later, without fingerprint
+(claude_agent.py counts a changed page without fingerprint as live).
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeLivingApps:
+    """In-memory LivingApps backend with fault injection."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, max_rps: float = None, retry_after: float = 1,
+                 seed: int = None, auto_publish: float = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.auto_publish = auto_publish
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.apps = {}
+            self.records = {}
+            self.params = {}
+            self.dashboard = {"fingerprint": None, "build": 0, "live_at": 0.0, "previous": (None, 0)}
+            self.requests = Counter()  # route name (e.g. "create_app") -> count
+            self.statuses = Counter()
+            self._window_start = time.monotonic()
+            self._window_count = 0
+
+    def publish_dashboard(self, fingerprint: str, delay: float = 0.0):
+        """Serve a dashboard build with ``fingerprint`` after ``delay`` seconds (simulated Pages build)."""
+        with self.lock:
+            self._publish(fingerprint, delay)
+
+    def _publish(self, fingerprint, delay: float):
+        previous = self._served_build()
+        self.dashboard = {"fingerprint": fingerprint, "build": previous[1] + 1,
+                          "live_at": time.monotonic() + delay, "previous": previous}
+
+    def _served_build(self) -> tuple:
+        """(fingerprint, build number) of the build currently served."""
+        if time.monotonic() >= self.dashboard["live_at"]:
+            return self.dashboard["fingerprint"], self.dashboard["build"]
+        return self.dashboard["previous"]
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "requests": sum(self.requests.values()),
+                "by_route": dict(self.requests),
+                "by_status": {str(k): v for k, v in self.statuses.items()},
+                "apps": len(self.apps),
+            }
+
+    # ================================================================
+    # Fault injection
+    # ================================================================
+
+    def _inject(self):
+        """Returns an error response (status, headers, body) or None."""
+        with self.lock:
+            if self.max_rps:
+                now = time.monotonic()
+                if now - self._window_start >= 1:
+                    self._window_start, self._window_count = now, 0
+                self._window_count += 1
+                if self._window_count > self.max_rps:
+                    return 429, {"Retry-After": str(self.retry_after)}, {"error": "Too Many Requests"}
+            roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            return 429, {"Retry-After": str(self.retry_after)}, {"error": "Too Many Requests"}
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 502, {}, {"error": "Bad Gateway"}
+        return None
+
+    def _sleep(self):
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    # ================================================================
+    # Request handling
+    # ================================================================
+
+    ROUTES = [
+        ("POST", r"/rest/apps", "create_app"),
+        ("GET", r"/rest/apps/(?P<app_id>\w+)", "get_app"),
+        ("PATCH", r"/rest/apps/(?P<app_id>\w+)", "patch_app"),
+        ("PUT", r"/rest/apps/(?P<app_id>\w+)/params/(?P<name>\w+)", "put_param"),
+        ("GET", r"/rest/appgroups/(?P<appgroup_id>[\w-]+)", "get_appgroup"),
+        ("GET", r"/rest/apps/(?P<app_id>\w+)/records", "list_records"),
+        ("POST", r"/rest/apps/(?P<app_id>\w+)/records", "create_record"),
+        ("GET", r"/rest/apps/(?P<app_id>\w+)/records/(?P<record_id>\w+)", "get_record"),
+        ("PATCH", r"/rest/apps/(?P<app_id>\w+)/records/(?P<record_id>\w+)", "update_record"),
+        ("DELETE", r"/rest/apps/(?P<app_id>\w+)/records/(?P<record_id>\w+)", "delete_record"),
+        ("GET", r"/github/(?P<appgroup_id>[\w-]+)/?", "get_dashboard"),
+    ]
+
+    def handle(self, method: str, path: str, body, headers=None):
+        """Dispatch a request. Returns ``(status, headers, payload)``."""
+        path = path.split("?", 1)[0]
+        if method == "GET" and path == "/_stats":
+            return 200, {}, self.stats()
+        if method == "POST" and path == "/_publish":
+            if not isinstance(body, dict) or not body.get("fingerprint"):
+                return 400, {}, {"error": "fingerprint required"}
+            self.publish_dashboard(body["fingerprint"], float(body.get("delay", 0)))
+            return 200, {}, {"fingerprint": body["fingerprint"]}
+
+        for route_method, pattern, name in self.ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                break
+        else:
+            return self._count(path, (404, {}, {"error": "Not Found"}))
+
+        self._sleep()
+        injected = self._inject()
+        if injected:
+            return self._count(name, injected)
+        if name == "get_dashboard":
+            return self._count(name, self.get_dashboard(headers or {}, **match.groupdict()))
+        try:
+            return self._count(name, getattr(self, name)(body or {}, **match.groupdict()))
+        except KeyError:
+            return self._count(name, (404, {}, {"error": "Not Found"}))
+
+    def _count(self, route, response):
+        with self.lock:
+            self.requests[route] += 1
+            self.statuses[response[0]] += 1
+        return response
+
+    @staticmethod
+    def _new_id() -> str:
+        return secrets.token_hex(12)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    @staticmethod
+    def _control(identifier: str, ctrl: dict) -> dict:
+        """Control as returned by LivingApps (shape of app_metadata.json)."""
+        fulltype = ctrl.get("fulltype", "string/text")
+        control = {
+            "identifier": identifier,
+            "label": ctrl.get("label", identifier),
+            "type": fulltype.split("/")[0],
+            "subtype": fulltype.split("/")[1] if "/" in fulltype else None,
+            "fulltype": fulltype,
+            "required": ctrl.get("required", False),
+            "in_list": ctrl.get("in_list", False),
+            "in_text": ctrl.get("in_text", False),
+        }
+        if "lookups" in ctrl:
+            control["lookup_data"] = ctrl["lookups"]
+        if "lookup_app" in ctrl:
+            control["lookup_app"] = ctrl["lookup_app"]
+        return control
+
+    def create_app(self, body):
+        if not body.get("name"):
+            return 400, {}, {"error": "name required"}
+        app_id = self._new_id()
+        app = {
+            "id": app_id,
+            "name": body["name"],
+            "controls": {k: self._control(k, v) for k, v in body.get("controls", {}).items()},
+        }
+        with self.lock:
+            self.apps[app_id] = app
+            self.records[app_id] = {}
+        return 200, {}, app
+
+    def get_app(self, body, app_id):
+        return 200, {}, self.apps[app_id]
+
+    def patch_app(self, body, app_id):
+        with self.lock:
+            app = self.apps[app_id]
+            for k, v in body.get("controls", {}).items():
+                app["controls"][k] = self._control(k, v)
+        return 200, {}, app
+
+    def put_param(self, body, app_id, name):
+        self.apps[app_id]
+        with self.lock:
+            self.params[(app_id, name)] = body.get("value")
+        return 200, {}, {"identifier": name, **body}
+
+    def get_appgroup(self, body, appgroup_id):
+        # One appgroup containing every app created on this server
+        with self.lock:
+            apps = {app["name"]: {"id": app_id, "name": app["name"]} for app_id, app in self.apps.items()}
+        return 200, {}, {"id": appgroup_id, "apps": apps}
+
+    def list_records(self, body, app_id):
+        return 200, {}, self.records[app_id]
+
+    def create_record(self, body, app_id):
+        record_id = self._new_id()
+        with self.lock:
+            self.records[app_id][record_id] = {
+                "id": record_id, "createdat": self._now(), "updatedat": None, "fields": body.get("fields", {}),
+            }
+        return 200, {}, {"id": record_id}
+
+    def get_record(self, body, app_id, record_id):
+        return 200, {}, self.records[app_id][record_id]
+
+    def update_record(self, body, app_id, record_id):
+        with self.lock:
+            record = self.records[app_id][record_id]
+            record["fields"].update(body.get("fields", {}))
+            record["updatedat"] = self._now()
+        return 200, {}, record
+
+    def delete_record(self, body, app_id, record_id):
+        with self.lock:
+            del self.records[app_id][record_id]
+        return 200, {}, {}
+
+    def get_dashboard(self, headers, appgroup_id):
+        with self.lock:
+            fingerprint, build = self._served_build()
+            if self.auto_publish is not None and time.monotonic() >= self.dashboard["live_at"]:
+                self._publish(None, self.auto_publish)
+        meta = f'<meta name="build-fingerprint" content="{fingerprint}">' if fingerprint else ""
+        html = (f"<!doctype html><html><head>{meta}<script type=\"module\" src=\"/assets/index-{build}.js\"></script>"
+                f"</head><body><div id=\"root\"></div></body></html>")
+        etag = '"%s"' % hashlib.sha1(html.encode("utf-8")).hexdigest()[:16]
+        if headers.get("if-none-match") == etag:
+            return 304, {"ETag": etag}, ""
+        return 200, {"Content-Type": "text/html; charset=utf-8", "ETag": etag}, html
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+        status, headers, payload = self.server.fake.handle(self.command, self.path, body, {k.lower(): v for k, v in self.headers.items()})
+
+        data = payload.encode("utf-8") if isinstance(payload, str) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", headers.pop("Content-Type", "application/json"))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(fake: FakeLivingApps, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start ``fake`` on a background thread. ``server.server_address`` has the real port."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.fake = fake
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency (0..jitter seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 502")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--max-rps", type=float, default=None, help="Answer 429 above this many requests per second")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After header of 429 responses")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--auto-publish", type=float, default=None, metavar="SECONDS",
+                        help="Start a new dashboard build (without fingerprint) on each dashboard request "
+                             "without a pending build, live after SECONDS")
+    args = parser.parse_args()
+
+    fake = FakeLivingApps(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, max_rps=args.max_rps,
+        retry_after=args.retry_after, seed=args.seed, auto_publish=args.auto_publish,
+    )
+    server = serve(fake, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"[FAKE] LivingApps stand-in on http://{host}:{port}")
+    print(f"[FAKE]   LIVINGAPPS_API_URL=http://{host}:{port}/rest")
+    print(f"[FAKE]   LIVINGAPPS_DASHBOARD_URL=http://{host}:{port}/github")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Write-if-changed output for generated files.
+
+generate_typescript writes through ``GeneratedFileManifest``: a file is only
+rewritten when its content changes, so mtimes (Vite HMR, ``tsc -b``
+incremental state) stay untouched for identical output. The content hashes
+of all generated files are kept in ``.generated_manifest.json``, which also
+shows whether a generated file was edited since it was generated.
+
+``write_stream`` consumes the ``(path, chunk)`` pairs of the generators'
+``iter_files`` and writes every file while the next one is still generated.
+
+Each entry also records the input fingerprint of the file (``file_inputs``
+of the generators). ``up_to_date`` returns the files whose inputs didn't
+change, generate_typescript passes them as ``skip`` and only regenerates
+the rest.
+"""
+import hashlib
+import json
+import os
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+MANIFEST_NAME = ".generated_manifest.json"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(f) -> str:
+    """content_hash of an open binary file, read in blocks (hashlib.file_digest needs Python 3.11)."""
+    digest = hashlib.sha256()
+    for block in iter(lambda: f.read(1 << 16), b""):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+class GeneratedFileManifest:
+    """Writes generated files only on content changes and records their hashes."""
+
+    def __init__(self, root=".", manifest_path=MANIFEST_NAME):
+        self.root = Path(root)
+        self.manifest_path = self.root / manifest_path
+        self.files = {}
+        if self.manifest_path.exists():
+            try:
+                self.files = json.loads(self.manifest_path.read_text(encoding="utf-8")).get("files", {})
+            except ValueError:
+                print(f"[MANIFEST] ⚠️ {self.manifest_path} unreadable, starting fresh")
+        # path -> "created" | "updated" | "unchanged" | "skipped" (inputs unchanged, not generated)
+        self.status = {}
+        # Generated files that were edited after generation (and are now overwritten)
+        self.modified = []
+        # Entries differ from the manifest on disk
+        self.dirty = False
+
+    def write(self, path: str, content: str) -> str:
+        """Write ``content`` to ``path`` unless it is already there. Returns the status."""
+        return self.write_chunks(path, [content])
+
+    def up_to_date(self, inputs: dict) -> set:
+        """Paths whose input fingerprint matches the recorded one and that are unmodified on disk.
+
+        They don't need to be generated again; their status becomes "skipped".
+        """
+        fresh = set()
+        for path, fingerprint in inputs.items():
+            recorded = self.files.get(path)
+            if not recorded or recorded.get("inputs") != fingerprint:
+                continue
+            target = self.root / path
+            try:
+                stat = target.stat()
+                if stat.st_size != recorded.get("bytes"):
+                    continue
+                # Same size and mtime as written: unmodified (like git's index), otherwise compare the hash
+                if stat.st_mtime_ns != recorded.get("mtime_ns"):
+                    with open(target, "rb") as f:
+                        if file_hash(f) != recorded.get("sha256"):
+                            continue
+            except OSError:
+                continue
+            fresh.add(path)
+            self.status[path] = "skipped"
+        return fresh
+
+    def write_chunks(self, path: str, chunks, inputs: str = None) -> str:
+        """Like ``write``, but takes the content as an iterable of string chunks.
+
+        Chunks are compared against the existing file as they arrive; only from
+        the first difference on a temporary file is written. Nothing but the
+        current chunk is held in memory.
+        """
+        target = self.root / path
+        tmp = target.with_name(f".{target.name}.tmp")
+        current = open(target, "rb") if target.is_file() else None
+        out = None
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                digest.update(data)
+                if out is None and current is not None and current.read(len(data)) == data:
+                    size += len(data)
+                    continue
+                if out is None:
+                    out = self._open_tmp(tmp, current, size)
+                out.write(data)
+                size += len(data)
+            # Neue Datei, oder die alte ist länger als der neue Inhalt
+            if out is None and (current is None or current.read(1)):
+                out = self._open_tmp(tmp, current, size)
+
+            if current is None:
+                status = "created"
+            elif out is None:
+                status = "unchanged"
+            else:
+                status = "updated"
+                current.seek(0)
+                recorded = self.files.get(path, {}).get("sha256")
+                if recorded and recorded != file_hash(current):
+                    self.modified.append(path)
+        except BaseException:
+            if out is not None:
+                out.close()
+                tmp.unlink(missing_ok=True)
+            raise
+        finally:
+            if current is not None:
+                current.close()
+
+        if out is not None:
+            out.close()
+            # Atomar ersetzen, damit Vite/tsc nie eine halb geschriebene Datei sehen
+            os.replace(tmp, target)
+
+        entry = {"sha256": digest.hexdigest(), "bytes": size, "mtime_ns": target.stat().st_mtime_ns}
+        if inputs:
+            entry["inputs"] = inputs
+        if self.files.get(path) != entry:
+            self.files[path] = entry
+            self.dirty = True
+        self.status[path] = status
+        return status
+
+    def write_stream(self, chunks, inputs: dict = None):
+        """Writes ``(path, chunk)`` pairs as they are produced.
+
+        Consecutive chunks of the same path form one file. Yields
+        ``(path, status)`` as soon as a file is complete. ``inputs`` are the
+        input fingerprints to record ({path: fingerprint}, see up_to_date).
+        """
+        inputs = inputs or {}
+        for path, group in groupby(chunks, key=itemgetter(0)):
+            yield path, self.write_chunks(path, (chunk for _, chunk in group), inputs.get(path))
+
+    @staticmethod
+    def _open_tmp(tmp: Path, current, prefix_bytes: int):
+        """Opens ``tmp`` for writing, starting with the already matched prefix of ``current``."""
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        out = open(tmp, "wb")
+        if current is not None and prefix_bytes:
+            current.seek(0)
+            remaining = prefix_bytes
+            while remaining:
+                block = current.read(min(remaining, 1 << 16))
+                out.write(block)
+                remaining -= len(block)
+        return out
+
+    @property
+    def changed(self) -> list:
+        return [path for path, status in self.status.items() if status in ("created", "updated")]
+
+    @property
+    def unchanged(self) -> list:
+        return [path for path, status in self.status.items() if status == "unchanged"]
+
+    @property
+    def skipped(self) -> list:
+        return [path for path, status in self.status.items() if status == "skipped"]
+
+    def save(self):
+        if not self.dirty and self.manifest_path.exists():
+            return
+        manifest = {"files": dict(sorted(self.files.items()))}
+        data = json.dumps(manifest, indent=2) + "\n"
+        if not self.manifest_path.exists() or self.manifest_path.read_text(encoding="utf-8") != data:
+            self.manifest_path.write_text(data, encoding="utf-8")
@@ -0,0 +1,85 @@
+"""
+Compiled keyword -> icon matcher for the sidebar and page icons.
+
+The keyword table is compiled once into two Aho-Corasick automatons (raw
+keywords and keywords with umlauts/digraphs collapsed). A lookup scans the
+identifier once per automaton, so its cost depends on the identifier length
+only, not on the number of keywords.
+
+Semantics are those of the former loop over ICON_MAP: the first keyword in
+table order that occurs in the identifier (directly or normalized) wins,
+not the leftmost occurrence.
+"""
+from collections import deque
+
+
+def normalize_for_icon_match(text: str) -> str:
+    """Collapse umlauts and ae/oe/ue digraphs to base vowels for fuzzy icon matching."""
+    text = text.replace("ä", "a").replace("ö", "o").replace("ü", "u").replace("ß", "ss")
+    text = text.replace("ae", "a").replace("oe", "o").replace("ue", "u")
+    return text
+
+
+class _Automaton:
+    """Aho-Corasick automaton that reports the lowest priority of all contained patterns."""
+
+    def __init__(self, patterns, no_match: int):
+        self.goto = [{}]
+        # Lowest priority of a pattern ending in this state (incl. its suffixes)
+        self.best = [no_match]
+        for pattern, priority in patterns:
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.best.append(no_match)
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.best[node] = min(self.best[node], priority)
+
+        # Failure links breadth-first, so the suffix state is final before its extensions
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.best[child] = min(self.best[child], self.best[self.fail[child]])
+                queue.append(child)
+
+    def lowest_priority(self, text: str) -> int:
+        goto, fail, best = self.goto, self.fail, self.best
+        node = 0
+        lowest = best[0]
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best[node] < lowest:
+                lowest = best[node]
+        return lowest
+
+
+class IconMatcher:
+    """Picks the icon of the first matching keyword of ``keyword_map`` (in dict order)."""
+
+    def __init__(self, keyword_map: dict, default: str = "FileText"):
+        keywords = [keyword.lower() for keyword in keyword_map]
+        self.icons = list(keyword_map.values())
+        self.default = default
+        no_match = len(keywords)
+        self._direct = _Automaton(((keyword, i) for i, keyword in enumerate(keywords)), no_match)
+        self._normalized = _Automaton(
+            ((normalize_for_icon_match(keyword), i) for i, keyword in enumerate(keywords)), no_match
+        )
+
+    def match(self, identifier: str) -> str:
+        lower = identifier.lower()
+        priority = min(
+            self._direct.lowest_priority(lower),
+            self._normalized.lowest_priority(normalize_for_icon_match(lower)),
+        )
+        return self.icons[priority] if priority < len(self.icons) else self.default
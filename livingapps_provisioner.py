@@ -0,0 +1,562 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+
+import httpx
+
+from request_scheduler import RequestScheduler
+
+DEFAULT_API_URL = "https://my.living-apps.de/rest"
+
+
+class ProvisioningError(Exception):
+    """A LivingApps app could not be created or updated."""
+
+
+def sort_apps_by_dependencies(apps):
+    """Group apps into dependency levels for LivingApps creation.
+
+    Level 0 holds apps without applookup dependencies inside ``apps``, level N
+    only depends on apps from levels < N. All apps of one level can therefore
+    be created concurrently once the previous level's app IDs are known.
+    References to apps outside ``apps`` (e.g. already existing ones) don't
+    count as dependencies. Runs in O(V+E).
+
+    Returns ``(levels, cyclic, cycles)``. ``cyclic`` lists the apps that are
+    part of (or depend on) an applookup cycle and thus can't be leveled; these
+    need the two-phase creation. ``cycles`` holds one concrete cycle per
+    strongly connected component as a list of identifiers in reference order,
+    e.g. ``["a", "b"]`` for a -> b -> a (``["a"]`` for a self-reference).
+    """
+    app_map = {}
+    dependencies = {}  # identifier -> referenced identifiers
+    dependents = {}    # identifier -> identifiers referencing it (reverse index)
+
+    for app in apps:
+        identifier = app["identifier"]
+        app_map[identifier] = app
+        dependencies[identifier] = set()
+        dependents[identifier] = []
+
+    for app in apps:
+        identifier = app["identifier"]
+        for ctrl in app.get("controls", {}).values():
+            if "applookup" in ctrl.get("fulltype", ""):
+                ref = ctrl.get("lookup_app_ref")
+                if ref and ref in app_map and ref not in dependencies[identifier]:
+                    dependencies[identifier].add(ref)
+                    dependents[ref].append(identifier)
+
+    # Topological sort (Kahn's algorithm), level = longest dependency chain
+    in_degree = {identifier: len(deps) for identifier, deps in dependencies.items()}
+    depth = dict.fromkeys(app_map, 0)
+    queue = deque(identifier for identifier, degree in in_degree.items() if degree == 0)
+    leveled = set()
+
+    while queue:
+        current = queue.popleft()
+        leveled.add(current)
+        for identifier in dependents[current]:
+            depth[identifier] = max(depth[identifier], depth[current] + 1)
+            in_degree[identifier] -= 1
+            if in_degree[identifier] == 0:
+                queue.append(identifier)
+
+    levels = [[] for _ in range(max((depth[i] for i in leveled), default=-1) + 1)]
+    for app in apps:
+        if app["identifier"] in leveled:
+            levels[depth[app["identifier"]]].append(app)
+
+    cyclic = [app for app in apps if app["identifier"] not in leveled]
+    cycles = _find_cycles([app["identifier"] for app in cyclic], dependencies) if cyclic else []
+
+    return levels, cyclic, cycles
+
+
+def _find_cycles(nodes, dependencies):
+    """One cycle per strongly connected component of ``nodes`` (iterative Tarjan)."""
+    node_set = set(nodes)
+    index = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    components = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(dependencies[root]))]
+        while work:
+            node, edges = work[-1]
+            for ref in edges:
+                if ref not in node_set:
+                    continue
+                if ref not in index:
+                    index[ref] = lowlink[ref] = len(index)
+                    stack.append(ref)
+                    on_stack.add(ref)
+                    work.append((ref, iter(dependencies[ref])))
+                    break
+                if ref in on_stack:
+                    lowlink[node] = min(lowlink[node], index[ref])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in dependencies[node]:
+                        components.append(component)
+
+    # Every member of a component references another member, so following
+    # references inside the component must run into a cycle
+    order = {node: position for position, node in enumerate(nodes)}
+    cycles = []
+    for component in sorted(components, key=lambda c: min(order[n] for n in c)):
+        path, seen = [], {}
+        node = min(component, key=order.get)
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = min((ref for ref in dependencies[node] if ref in component), key=order.get)
+        cycles.append(path[seen[node]:])
+    return cycles
+
+
+def control_spec(app_def):
+    """Normalized control specification of an app definition.
+
+    This is what gets sent to the API, except that applookup targets
+    are kept as ``lookup_app_ref`` identifiers. Stored per app in
+    app_metadata.json (with its hash) to detect schema changes later.
+    """
+    spec = {}
+    for ctrl_name, ctrl in app_def.get("controls", {}).items():
+        ctrl_data = {
+            "fulltype": ctrl["fulltype"],
+            "label": ctrl["label"],
+            "required": ctrl.get("required", False),
+            "in_list": ctrl.get("in_list", False),
+            "in_text": ctrl.get("in_text", False),
+        }
+
+        # Convert lookups array to dict format
+        # plan.md uses: [{"key": "x", "value": "Y"}]
+        # LivingApps API expects: {"x": "Y"}
+        if "lookups" in ctrl:
+            lookups = ctrl["lookups"]
+            if isinstance(lookups, list):
+                ctrl_data["lookups"] = {item["key"]: item["value"] for item in lookups}
+            else:
+                ctrl_data["lookups"] = lookups
+
+        if "applookup" in ctrl.get("fulltype", "") and ctrl.get("lookup_app_ref"):
+            ctrl_data["lookup_app_ref"] = ctrl["lookup_app_ref"]
+
+        spec[ctrl_name] = ctrl_data
+    return spec
+
+
+def spec_hash(spec):
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def without_specs(apps_data):
+    """App metadata as returned to the agent (the stored specs are only needed here)."""
+    return {identifier: {k: v for k, v in app_data.items() if k != "spec"} for identifier, app_data in apps_data.items()}
+
+
+class AppProvisioner:
+    """
+    Creates and updates LivingApps apps from app definitions.
+
+    - New apps are created level by level (see ``sort_apps_by_dependencies``),
+      or in two phases (skeletons first, applookup controls afterwards) when
+      the applookup references contain a cycle.
+    - Every created app is recorded in a write-ahead journal, so a failed
+      call can be resumed without creating apps twice.
+    - Existing apps are diffed against their stored control spec and only
+      receive the added/changed controls.
+    - Requests go through a ``RequestScheduler``: rate limits (429) are
+      waited out, the PATCH calls are retried as idempotent; a create that
+      fails with 5xx is not retried blindly but resumed from the journal.
+
+    The result is merged into ``metadata_path`` (app_metadata.json).
+    """
+
+    def __init__(self, client: RequestScheduler, api_url: str = DEFAULT_API_URL,
+                 metadata_path="app_metadata.json", journal_path="app_metadata.journal.jsonl",
+                 max_concurrency: int = 8):
+        self.client = client
+        self.api_url = api_url.rstrip("/")
+        self.metadata_path = Path(metadata_path)
+        self.journal_path = Path(journal_path)
+        # Max. number of parallel requests per round
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    # ================================================================
+    # Persistence
+    # ================================================================
+
+    def _load_metadata(self) -> dict:
+        """Load existing metadata if present (to support adding apps later)."""
+        if not self.metadata_path.exists():
+            return {}
+        try:
+            with open(self.metadata_path, "r") as f:
+                existing_apps = json.load(f).get("apps", {})
+            print(f"[LIVINGAPPS] 📂 Found {len(existing_apps)} existing apps, will add new ones")
+            return existing_apps
+        except Exception as e:
+            print(f"[LIVINGAPPS] ⚠️ Could not read existing metadata: {e}")
+            return {}
+
+    def _replay_journal(self):
+        """Apps recorded by an interrupted previous call (and their pending applookup controls).
+
+        These already exist in LivingApps and are never created again.
+        """
+        resumed_apps = {}
+        resumed_deferred = {}
+        if not self.journal_path.exists():
+            return resumed_apps, resumed_deferred
+
+        with open(self.journal_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Partially written last line
+                identifier = entry["identifier"]
+                if entry["event"] == "created":
+                    resumed_apps[identifier] = {
+                        "app_id": entry["app_id"],
+                        "name": entry["name"],
+                        "controls": entry["controls"],
+                        "spec": entry["spec"],
+                        "spec_hash": spec_hash(entry["spec"])
+                    }
+                    if entry.get("deferred"):
+                        resumed_deferred[identifier] = entry["deferred"]
+                elif entry["event"] == "patched" and identifier in resumed_apps:
+                    resumed_apps[identifier]["controls"] = entry["controls"]
+                    resumed_deferred.pop(identifier, None)
+        if resumed_apps:
+            print(f"[LIVINGAPPS] 📓 Resuming: {len(resumed_apps)} apps already created by a previous attempt")
+        return resumed_apps, resumed_deferred
+
+    def _append_journal(self, entry):
+        """Append one entry to the write-ahead journal and flush it to disk."""
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ================================================================
+    # Payload helpers
+    # ================================================================
+
+    def _build_controls(self, spec):
+        """Build the controls payload for the API from a control spec.
+
+        Returns ``(controls, deferred)``: applookup controls whose target app
+        doesn't exist yet end up in ``deferred`` instead of being dropped.
+        """
+        controls = {}
+        deferred = {}
+        for ctrl_name, ctrl_data in spec.items():
+            ctrl_data = dict(ctrl_data)
+            ref = ctrl_data.pop("lookup_app_ref", None)
+
+            # Resolve applookup references to real app URLs
+            # Check both existing and already created apps
+            if ref and ref in self.identifier_to_id:
+                ctrl_data["lookup_app"] = f"{self.api_url}/apps/{self.identifier_to_id[ref]}"
+            elif ref:
+                deferred[ctrl_name] = {"ref": ref, "control": ctrl_data}
+                continue
+
+            controls[ctrl_name] = ctrl_data
+        return controls, deferred
+
+    def _merge_controls(self, identifier, controls):
+        """Merge changed controls into an app's metadata, keeping the spec's field order."""
+        controls = {**self.created[identifier]["controls"], **controls}
+        if identifier in self.spec_by_identifier:
+            order = list(self.spec_by_identifier[identifier]["controls"])
+            controls = dict(sorted(
+                controls.items(),
+                key=lambda item: order.index(item[0]) if item[0] in order else len(order)
+            ))
+        return controls
+
+    # ================================================================
+    # API calls
+    # ================================================================
+
+    async def _create_app(self, app_def):
+        """Create a single app via LivingApps REST API."""
+        spec = control_spec(app_def)
+        controls, deferred = self._build_controls(spec)
+        async with self.semaphore:
+            print(f"[LIVINGAPPS] Creating: {app_def['name']}...")
+            response = await self.client.post(
+                f"{self.api_url}/apps",
+                json={"name": app_def["name"], "controls": controls},
+                timeout=60
+            )
+            response.raise_for_status()
+            result = response.json()
+        # Record the app right away, so a retry never creates it twice
+        self._append_journal({
+            "event": "created",
+            "identifier": app_def["identifier"],
+            "app_id": result["id"],
+            "name": app_def["name"],
+            "controls": result.get("controls", {}),
+            "spec": spec,
+            "deferred": deferred
+        })
+        return result, spec, deferred
+
+    async def _patch_app(self, identifier):
+        """Add the deferred applookup controls to an already created app."""
+        controls = {}
+        for ctrl_name, item in self.deferred_controls[identifier].items():
+            controls[ctrl_name] = dict(item["control"], lookup_app=f"{self.api_url}/apps/{self.identifier_to_id[item['ref']]}")
+        async with self.semaphore:
+            print(f"[LIVINGAPPS] Adding applookup fields: {self.created[identifier]['name']}...")
+            response = await self.client.patch(
+                f"{self.api_url}/apps/{self.identifier_to_id[identifier]}",
+                json={"controls": controls},
+                idempotent=True,
+                timeout=60
+            )
+            response.raise_for_status()
+            result = response.json()
+
+        controls = self._merge_controls(identifier, result.get("controls", controls))
+        self._append_journal({"event": "patched", "identifier": identifier, "controls": controls})
+        return controls
+
+    async def _migrate_app(self, identifier):
+        """Send only the added or changed controls of an existing app."""
+        spec, changes = self.migrations[identifier]
+        controls, _ = self._build_controls(changes)
+        if controls:
+            async with self.semaphore:
+                print(f"[LIVINGAPPS] Updating {len(controls)} fields: {self.created[identifier]['name']}...")
+                response = await self.client.patch(
+                    f"{self.api_url}/apps/{self.identifier_to_id[identifier]}",
+                    json={"controls": controls},
+                    idempotent=True,
+                    timeout=60
+                )
+                response.raise_for_status()
+                controls = response.json().get("controls", controls)
+        return dict(
+            self.created[identifier],
+            controls=self._merge_controls(identifier, controls),
+            spec=spec,
+            spec_hash=spec_hash(spec)
+        )
+
+    @staticmethod
+    def _raise_first_error(action, names, results):
+        for name, result in zip(names, results):
+            if isinstance(result, httpx.HTTPStatusError):
+                error_msg = f"Error {action} '{name}': {result.response.text}"
+            elif isinstance(result, Exception):
+                error_msg = f"Error {action} '{name}': {str(result)}"
+            else:
+                continue
+            print(f"[LIVINGAPPS] ❌ {error_msg}")
+            raise ProvisioningError(error_msg)
+
+    # ================================================================
+    # Main entry point
+    # ================================================================
+
+    async def create_apps(self, apps: list, two_phase: bool = False) -> dict:
+        """Create/update ``apps`` and return the result summary including metadata.
+
+        Raises ``ProvisioningError`` if an app can't be created or updated.
+        """
+        existing_apps = self._load_metadata()
+        resumed_apps, resumed_deferred = self._replay_journal()
+        self.spec_by_identifier = {app_def["identifier"]: app_def for app_def in apps}
+
+        # Apps that already exist: diff their control spec against the stored one
+        self.migrations = {}  # identifier -> (new spec, controls to add or change)
+        for app_def in apps:
+            identifier = app_def["identifier"]
+            stored = existing_apps.get(identifier)
+            if stored is None:
+                continue
+            spec = control_spec(app_def)
+            if stored.get("spec_hash") == spec_hash(spec):
+                continue  # Unchanged: no network call at all
+            if "spec" in stored:
+                changes = {name: ctrl for name, ctrl in spec.items() if stored["spec"].get(name) != ctrl}
+            else:
+                # Created before specs were stored: only new controls can be detected
+                changes = {name: ctrl for name, ctrl in spec.items() if name not in stored.get("controls", {})}
+            self.migrations[identifier] = (spec, changes)
+
+        # Filter out apps that already exist
+        new_apps = [app for app in apps if app["identifier"] not in existing_apps and app["identifier"] not in resumed_apps]
+
+        if not new_apps and not resumed_apps and not self.migrations:
+            print("[LIVINGAPPS] ℹ️ All apps already exist, nothing to create")
+            # Return existing metadata
+            metadata = {
+                "appgroup_id": None,
+                "appgroup_name": "Auto-Generated",
+                "apps": without_specs(existing_apps),
+                "metadata": {"apps_list": [app["name"] for app in existing_apps.values()]}
+            }
+            return {
+                "success": True,
+                "message": "All apps already exist, no new apps created",
+                "existing_apps": list(existing_apps.keys()),
+                "metadata": metadata
+            }
+
+        t_create_start = time.time()
+        print(f"[LIVINGAPPS] 🏗️ Creating {len(new_apps)} new apps...")
+        if self.migrations:
+            print(f"[LIVINGAPPS] 🔧 Changed apps: {', '.join(self.migrations)}")
+
+        # Every applookup reference must point to an existing or a new app
+        known_identifiers = set(existing_apps) | set(resumed_apps) | {app["identifier"] for app in new_apps}
+        for app_def in new_apps + [self.spec_by_identifier[identifier] for identifier in self.migrations]:
+            for ctrl_name, ctrl in app_def.get("controls", {}).items():
+                ref = ctrl.get("lookup_app_ref")
+                if "applookup" in ctrl.get("fulltype", "") and ref and ref not in known_identifiers:
+                    error_msg = f"Error in '{app_def['name']}': field '{ctrl_name}' references unknown app '{ref}'"
+                    print(f"[LIVINGAPPS] ❌ {error_msg}")
+                    raise ProvisioningError(error_msg)
+
+        # Group by dependencies (apps without applookup first)
+        levels, cyclic, cycles = sort_apps_by_dependencies(new_apps)
+        two_phase = two_phase or bool(cyclic)
+        for cycle in cycles:
+            print(f"[LIVINGAPPS] 🔁 Cyclic applookup references: {' → '.join(cycle + cycle[:1])}")
+        if two_phase:
+            # Phase 1: all skeletons in one round, phase 2: patch applookup fields
+            print("[LIVINGAPPS] Two-phase mode: creating apps first, applookup fields afterwards")
+            levels = [new_apps]
+
+        # Start with existing (and resumed) apps data
+        self.created = {**existing_apps, **resumed_apps}
+        self.identifier_to_id = {identifier: app_data["app_id"] for identifier, app_data in self.created.items()}
+        self.deferred_controls = dict(resumed_deferred)  # identifier -> applookup controls to patch in phase 2
+        newly_created = []
+
+        for level_no, level in enumerate(levels, 1):
+            print(f"[LIVINGAPPS] Level {level_no}/{len(levels)}: {len(level)} apps")
+            results = await asyncio.gather(
+                *(self._create_app(app_def) for app_def in level),
+                return_exceptions=True
+            )
+
+            for app_def, result in zip(level, results):
+                if isinstance(result, Exception):
+                    continue
+                result, spec, deferred = result
+                identifier = app_def["identifier"]
+                app_id = result["id"]
+                self.identifier_to_id[identifier] = app_id
+                self.created[identifier] = {
+                    "app_id": app_id,
+                    "name": app_def["name"],
+                    "controls": result.get("controls", {}),
+                    "spec": spec,
+                    "spec_hash": spec_hash(spec)
+                }
+                if deferred:
+                    self.deferred_controls[identifier] = deferred
+                newly_created.append(identifier)
+                print(f"[LIVINGAPPS] ✅ Created: {app_def['name']} ({app_id})")
+
+            self._raise_first_error("creating", [app_def["name"] for app_def in level], results)
+
+        # Phase 2: add applookup controls now that all app IDs are known
+        to_patch = list(self.deferred_controls)
+        if to_patch:
+            print(f"[LIVINGAPPS] 🔗 Adding applookup fields to {len(to_patch)} apps...")
+            results = await asyncio.gather(
+                *(self._patch_app(identifier) for identifier in to_patch),
+                return_exceptions=True
+            )
+
+            for identifier, result in zip(to_patch, results):
+                if isinstance(result, Exception):
+                    continue
+                self.created[identifier]["controls"] = result
+                print(f"[LIVINGAPPS] ✅ Applookup fields added: {self.created[identifier]['name']}")
+
+            self._raise_first_error("adding applookup fields to", [self.created[identifier]["name"] for identifier in to_patch], results)
+
+        # Schema changes of existing apps (all referenced apps exist by now)
+        if self.migrations:
+            to_migrate = list(self.migrations)
+            results = await asyncio.gather(
+                *(self._migrate_app(identifier) for identifier in to_migrate),
+                return_exceptions=True
+            )
+
+            for identifier, result in zip(to_migrate, results):
+                if isinstance(result, Exception):
+                    continue
+                self.created[identifier] = result
+                print(f"[LIVINGAPPS] ✅ Updated: {self.created[identifier]['name']}")
+
+            self._raise_first_error("updating", [self.created[identifier]["name"] for identifier in to_migrate], results)
+
+        # Build combined metadata (existing + new apps)
+        created = self.created
+        metadata = {
+            "appgroup_id": None,
+            "appgroup_name": "Auto-Generated",
+            "apps": created,
+            "metadata": {"apps_list": [app["name"] for app in created.values()]}
+        }
+
+        # Save metadata to file for future reference
+        try:
+            with open(self.metadata_path, "w") as f:
+                json.dump(metadata, f, indent=2)
+            print(f"[LIVINGAPPS] 💾 Saved {self.metadata_path.name}")
+            # Everything is in app_metadata.json now, the journal is no longer needed
+            self.journal_path.unlink(missing_ok=True)
+        except Exception as e:
+            print(f"[LIVINGAPPS] ⚠️ Could not save metadata: {e}")
+
+        t_create_total = time.time() - t_create_start
+        print(f"[LIVINGAPPS] ✅ Created {len(newly_created)} new apps! Total apps: {len(created)} ({t_create_total:.1f}s)")
+
+        return {
+            "success": True,
+            "message": f"Created {len(newly_created)} new LivingApps apps ({t_create_total:.1f}s)",
+            "apps_created": newly_created,
+            "apps_resumed": list(resumed_apps.keys()),
+            "apps_updated": list(self.migrations.keys()),
+            "existing_apps": list(existing_apps.keys()),
+            "total_apps": list(created.keys()),
+            "metadata": dict(metadata, apps=without_specs(created))
+        }
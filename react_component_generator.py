@@ -1,5 +1,13 @@
 import re
 
+import icon_matcher
+import schema_index
+from icon_matcher import IconMatcher
+from schema_index import SchemaIndex, input_fingerprint, source_version
+
+# Code changes invalidate all input fingerprints
+GENERATOR_VERSION = source_version(__file__, schema_index.__file__, icon_matcher.__file__)
+
 
 class ReactComponentGenerator:
     """
@@ -20,6 +28,7 @@ class ReactComponentGenerator:
     Auto-detects language (DE/EN) from entity metadata for all UI text.
     """
 
+    # Keyword -> lucide icon; the first keyword in this order that occurs wins
     ICON_MAP = {
         # People
         "user": "Users", "member": "Users", "employee": "Users",
@@ -119,13 +128,14 @@ class ReactComponentGenerator:
         }
     }
 
-    def __init__(self, metadata: dict, crud_scaffolds: list):
+    def __init__(self, metadata: dict, crud_scaffolds: list, index: SchemaIndex = None, icon_map: dict = None):
         self.metadata = metadata
-        self.apps = metadata.get("apps", {})
+        self.index = index or SchemaIndex(metadata)
+        self.icon_map = icon_map
+        self.icon_matcher = self._compile_icon_matcher(icon_map)
+        self.apps = self.index.apps
         self.crud_scaffolds = [s for s in crud_scaffolds if s in self.apps]
-        self.app_id_to_identifier = {
-            data["app_id"]: key for key, data in self.apps.items()
-        }
+        self.app_id_to_identifier = self.index.app_id_to_identifier
         self.lang = self._detect_language()
 
     # ================================================================
@@ -142,22 +152,26 @@ class ReactComponentGenerator:
             'beschreibung', 'bezeichnung', 'bemerkung', 'anmerkung',
         }
 
-        text_parts = []
-        for data in self.apps.values():
-            text_parts.append(data.get('name', ''))
-            for ctrl in data.get('controls', {}).values():
-                text_parts.append(ctrl.get('label', ''))
+        def texts():
+            for data in self.apps.values():
+                yield data.get('name', '')
+                for ctrl in data.get('controls', {}).values():
+                    yield ctrl.get('label', '')
 
-        text = ' '.join(text_parts).lower()
+        # Text by text instead of one joined string: stops at the first hit
+        # and doesn't hold all labels of a large schema at once
+        found_words = set()
+        for text in texts():
+            text = text.lower()
 
-        # German umlauts/ß are a strong signal
-        if any(c in text for c in german_chars):
-            return 'de'
+            # German umlauts/ß are a strong signal
+            if any(c in text for c in german_chars):
+                return 'de'
 
-        # Check for common German words
-        words = set(re.split(r'\W+', text))
-        if len(words & german_words) >= 2:
-            return 'de'
+            # Check for common German words
+            found_words.update(german_words.intersection(re.split(r'\W+', text)))
+            if len(found_words) >= 2:
+                return 'de'
 
         return 'en'
 
@@ -170,19 +184,17 @@ class ReactComponentGenerator:
         return text
 
     # ================================================================
-    # Naming helpers — MUST match TypeScriptGenerator exactly
+    # Naming helpers — shared with TypeScriptGenerator via SchemaIndex
     # ================================================================
 
-    def _to_pascal_case(self, text: str) -> str:
-        text = text.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
-        return "".join(word.capitalize() for word in re.sub(r"[^a-zA-Z0-9]", " ", text).split())
+    def _to_pascal_case(self, identifier: str) -> str:
+        return self.index.pascal[identifier]
 
-    def _to_singular(self, pascal_name: str) -> str:
-        return pascal_name[:-1] if pascal_name.endswith("s") else f"{pascal_name}Entry"
+    def _to_singular(self, identifier: str) -> str:
+        return self.index.singular[identifier]
 
     def _to_const_name(self, identifier: str) -> str:
-        name = identifier.upper().replace("-", "_").replace("&", "").replace(" ", "_")
-        return re.sub(r"_+", "_", name)
+        return self.index.const[identifier]
 
     # ================================================================
     # Analysis helpers
@@ -190,83 +202,34 @@ class ReactComponentGenerator:
 
     def _get_display_field(self, identifier: str) -> str:
         """Which field to show for an entity in dropdowns / table lookups."""
-        if identifier not in self.apps:
-            return "record_id"
-        controls = self.apps[identifier].get("controls", {})
-
-        for key, ctrl in controls.items():
-            if ctrl.get("fulltype") == "string/text" and ctrl.get("in_list"):
-                return key
-        for name in ["name", "title", "bezeichnung", "label", "titel", "description"]:
-            if name in controls:
-                return name
-        for key, ctrl in controls.items():
-            if "string" in ctrl.get("fulltype", ""):
-                return key
-        return next(iter(controls.keys()), "record_id")
-
-    @staticmethod
-    def _normalize_for_icon_match(text: str) -> str:
-        """Collapse umlauts and ae/oe/ue digraphs to base vowels for fuzzy icon matching."""
-        text = text.replace("ä", "a").replace("ö", "o").replace("ü", "u").replace("ß", "ss")
-        text = text.replace("ae", "a").replace("oe", "o").replace("ue", "u")
-        return text
+        return self.index.display_field.get(identifier, "record_id")
+
+    @classmethod
+    def _compile_icon_matcher(cls, icon_map: dict = None) -> IconMatcher:
+        """Keywords of ``icon_map`` take precedence over ICON_MAP. The default table is compiled once per class."""
+        if icon_map:
+            merged = {keyword.lower(): icon for keyword, icon in icon_map.items()}
+            for keyword, icon in cls.ICON_MAP.items():
+                merged.setdefault(keyword, icon)
+            return IconMatcher(merged)
+        if "_default_icon_matcher" not in cls.__dict__:
+            cls._default_icon_matcher = IconMatcher(cls.ICON_MAP)
+        return cls._default_icon_matcher
 
     def _get_icon_name(self, identifier: str) -> str:
-        lower = identifier.lower()
-        norm_id = self._normalize_for_icon_match(lower)
-        for keyword, icon in self.ICON_MAP.items():
-            # Direct match first, then normalized match
-            if keyword in lower:
-                return icon
-            norm_kw = self._normalize_for_icon_match(keyword)
-            if norm_kw in norm_id:
-                return icon
-        return "FileText"
+        return self.icon_matcher.match(identifier)
 
     def _get_applookup_deps(self, identifier: str) -> list:
         """All applookup fields and their target entities for a given entity."""
-        deps = []
-        if identifier not in self.apps:
-            return deps
-        controls = self.apps[identifier].get("controls", {})
-        for ctrl_key, ctrl_data in controls.items():
-            if "applookup" not in ctrl_data.get("fulltype", ""):
-                continue
-            lookup_app_url = ctrl_data.get("lookup_app", "")
-            if not lookup_app_url:
-                continue
-            try:
-                target_app_id = lookup_app_url.rstrip("/").split("/")[-1]
-                target_identifier = self.app_id_to_identifier.get(target_app_id)
-                if target_identifier:
-                    deps.append({
-                        "ctrl_key": ctrl_key,
-                        "target_identifier": target_identifier,
-                        "target_pascal": self._to_pascal_case(target_identifier),
-                        "target_const": self._to_const_name(target_identifier),
-                        "display_field": self._get_display_field(target_identifier),
-                    })
-            except Exception:
-                pass
-        return deps
+        return self.index.relations.get(identifier, [])
 
     def _get_unique_applookup_entities(self, identifier: str) -> list:
         """Deduplicated target entities (one entry per referenced entity)."""
-        deps = self._get_applookup_deps(identifier)
-        seen = {}
-        for dep in deps:
-            t = dep["target_identifier"]
-            if t not in seen:
-                seen[t] = dep
-        return list(seen.values())
+        return self.index.unique_relations.get(identifier, [])
 
     def _has_date_fields(self, identifier: str) -> bool:
         """Check if entity has any date/datetime fields."""
-        if identifier not in self.apps:
-            return False
-        controls = self.apps[identifier].get("controls", {})
-        return any('date' in c.get('fulltype', '') for c in controls.values())
+        return self.index.has_date_fields.get(identifier, False)
 
     # ================================================================
     # Main entry point
@@ -274,27 +237,75 @@ class ReactComponentGenerator:
 
     def generate_all(self) -> dict:
         """Returns {filepath: content} for all files to generate."""
-        files = {}
+        return dict(self.iter_files())
 
-        files["src/App.tsx"] = self._generate_app_router()
-        files["src/components/Layout.tsx"] = self._generate_layout()
-        files["src/components/PageShell.tsx"] = self._generate_page_shell()
-        files["src/pages/DashboardOverview.tsx"] = self._generate_overview()
-        files["src/components/ConfirmDialog.tsx"] = self._generate_confirm_dialog()
-        files["src/components/StatCard.tsx"] = self._generate_stat_card()
+    def _entity_paths(self, identifier: str) -> tuple:
+        pascal = self._to_pascal_case(identifier)
+        return f"src/pages/{pascal}Page.tsx", f"src/components/dialogs/{pascal}Dialog.tsx"
+
+    def file_inputs(self) -> dict:
+        """{filepath: input fingerprint} in iter_files order, without generating anything.
+
+        Entity pages/dialogs depend on the entity itself and on the names and
+        display fields of the entities it looks up; a control change in one
+        app therefore only changes that app's files (and app.ts).
+        """
+        base = (GENERATOR_VERSION, self.lang)
+        nav = [[identifier, data.get("name")] for identifier, data in self.apps.items()]
+        icons = [self._get_icon_name(identifier) for identifier in self.apps]
+        static = input_fingerprint(*base)
+        inputs = {
+            "src/App.tsx": input_fingerprint(*base, list(self.apps)),
+            "src/components/Layout.tsx": input_fingerprint(*base, nav, icons),
+            "src/components/PageShell.tsx": static,
+            "src/pages/DashboardOverview.tsx": input_fingerprint(*base, nav),
+            "src/components/ConfirmDialog.tsx": static,
+            "src/components/StatCard.tsx": static,
+        }
+        for identifier in self.crud_scaffolds:
+            fingerprint = input_fingerprint(
+                *base, identifier, self.index.app_fingerprints[identifier], self._get_applookup_deps(identifier)
+            )
+            for path in self._entity_paths(identifier):
+                inputs[path] = fingerprint
+        for identifier in self.apps:
+            if identifier not in self.crud_scaffolds:
+                page_path = f"src/pages/{self._to_pascal_case(identifier)}Page.tsx"
+                inputs[page_path] = input_fingerprint(*base, identifier, self.apps[identifier].get("name"))
+        return inputs
+
+    def iter_files(self, skip=()):
+        """Streams (filepath, content) pairs in generate_all order.
+
+        Each file is generated only when the previous one was consumed, so a
+        caller writing them to disk holds one entity at a time. Paths in
+        ``skip`` (up to date according to file_inputs) are not generated.
+        """
+        shared = [
+            ("src/App.tsx", self._generate_app_router),
+            ("src/components/Layout.tsx", self._generate_layout),
+            ("src/components/PageShell.tsx", self._generate_page_shell),
+            ("src/pages/DashboardOverview.tsx", self._generate_overview),
+            ("src/components/ConfirmDialog.tsx", self._generate_confirm_dialog),
+            ("src/components/StatCard.tsx", self._generate_stat_card),
+        ]
+        for path, generate in shared:
+            if path not in skip:
+                yield path, generate()
 
         for identifier in self.crud_scaffolds:
-            pascal = self._to_pascal_case(identifier)
-            files[f"src/pages/{pascal}Page.tsx"] = self._generate_entity_page(identifier)
-            files[f"src/components/dialogs/{pascal}Dialog.tsx"] = self._generate_entity_dialog(identifier)
+            page_path, dialog_path = self._entity_paths(identifier)
+            if page_path in skip and dialog_path in skip:
+                continue
+            yield page_path, self._generate_entity_page(identifier)
+            yield dialog_path, self._generate_entity_dialog(identifier)
 
         # Placeholder pages for non-scaffolded entities
         for identifier in self.apps:
             if identifier not in self.crud_scaffolds:
-                pascal = self._to_pascal_case(identifier)
-                files[f"src/pages/{pascal}Page.tsx"] = self._generate_placeholder_page(identifier)
-
-        return files
+                page_path = f"src/pages/{self._to_pascal_case(identifier)}Page.tsx"
+                if page_path not in skip:
+                    yield page_path, self._generate_placeholder_page(identifier)
 
     # ================================================================
     # PageShell.tsx — Consistent page header wrapper
@@ -654,7 +665,7 @@ export function StatCard({ title, value, description, icon }: StatCardProps) {
         app_data = self.apps[identifier]
         controls = app_data.get("controls", {})
         pascal = self._to_pascal_case(identifier)
-        singular = self._to_singular(pascal)
+        singular = self._to_singular(identifier)
         label = app_data.get("name", pascal)
 
         deps = self._get_applookup_deps(identifier)
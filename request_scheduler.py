@@ -0,0 +1,148 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import httpx
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUS = {429, 502, 503, 504}
+
+
+class _HostState:
+    """Token bucket, concurrency limit and 429 back-off of one host."""
+
+    def __init__(self, rate, burst: int, max_concurrency: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def acquire_token(self):
+        while True:
+            now = time.monotonic()
+            if self.blocked_until > now:
+                # Retry-After of a previous 429 applies to all requests to this host
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            if not self.rate:
+                return
+            self.tokens = min(self.capacity, self.tokens + (now - self.refilled_at) * self.rate)
+            self.refilled_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RequestScheduler:
+    """
+    Rate-limit-aware wrapper around a shared ``httpx.AsyncClient``.
+
+    Offers the same ``get/post/put/patch/delete`` calls as the client, but per host:
+    - token bucket rate limiting (``rate`` requests/s, bursts up to ``burst``;
+      ``rate=None`` disables it)
+    - at most ``max_concurrency`` requests in flight
+    - 429 responses pause the host for ``Retry-After`` and are always retried
+      (the request was rejected, not processed)
+    - 502/503/504 and network errors are retried with jittered exponential
+      backoff, but only for idempotent calls (GET/PUT/DELETE, or ``idempotent=True``);
+      connection failures are retried for every call since nothing was sent.
+
+    After ``max_attempts`` the last response is returned (or the error raised),
+    so callers keep using ``raise_for_status()``.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, rate: float = 20.0, burst: int = 40,
+                 max_concurrency: int = 8, max_attempts: int = 5,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0):
+        self.client = client
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hosts = {}
+        self.retries = 0
+
+    def _host(self, url: str) -> _HostState:
+        host = urlsplit(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = _HostState(self.rate, self.burst, self.max_concurrency)
+        return self.hosts[host]
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response: httpx.Response):
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    async def request(self, method: str, url: str, idempotent: bool = None, **kwargs) -> httpx.Response:
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        host = self._host(url)
+
+        for attempt in range(self.max_attempts):
+            last_attempt = attempt == self.max_attempts - 1
+            await host.acquire_token()
+            try:
+                async with host.semaphore:
+                    response = await self.client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if last_attempt:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"[HTTP] ⚠️ {method} {url}: connection failed, retry in {delay:.1f}s")
+            except httpx.TransportError as e:
+                if last_attempt or not idempotent:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"[HTTP] ⚠️ {method} {url}: {type(e).__name__}, retry in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUS or last_attempt:
+                    return response
+                if response.status_code == 429:
+                    retry_after = self._retry_after(response)
+                    delay = retry_after if retry_after is not None else self._backoff(attempt)
+                    host.blocked_until = max(host.blocked_until, time.monotonic() + delay)
+                    # Spread the retries of all waiting requests a bit
+                    delay += random.uniform(0, self.backoff_base)
+                elif idempotent:
+                    delay = self._backoff(attempt)
+                else:
+                    return response
+                print(f"[HTTP] ⏳ {method} {url}: {response.status_code}, retry in {delay:.1f}s")
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
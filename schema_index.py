@@ -0,0 +1,135 @@
+"""
+Schema index shared by TypeScriptGenerator and ReactComponentGenerator.
+
+Everything the generators derive per app from app_metadata.json (PascalCase,
+const and singular names, resolved applookup relations, display fields) is
+computed once per metadata here instead of once per emitted file. The naming
+rules only live here, so both generators always agree on them.
+
+``input_fingerprint`` hashes what one generated file depends on; the
+generators' ``file_inputs`` use it so unchanged files can be skipped.
+"""
+import hashlib
+import json
+import re
+from pathlib import Path
+
+DISPLAY_FIELD_NAMES = ["name", "title", "bezeichnung", "label", "titel", "description"]
+
+
+def to_pascal_case(text: str) -> str:
+    """Macht aus 'workout_logs' -> 'WorkoutLogs'"""
+    # Umlaute ersetzen
+    text = text.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
+    # Alles was kein Buchstabe/Zahl ist zu Space, dann Capitalize
+    return "".join(word.capitalize() for word in re.sub(r"[^a-zA-Z0-9]", " ", text).split())
+
+
+def to_const_name(identifier: str) -> str:
+    """WORKOUT_LOGS statt WorkoutLogs"""
+    name = identifier.upper().replace("-", "_").replace("&", "").replace(" ", "_")
+    # Doppelte Underscores bereinigen
+    return re.sub(r"_+", "_", name)
+
+
+def to_singular(pascal_name: str) -> str:
+    """Einfache Heuristik: Wenn es auf 's' endet, weg damit. Sonst 'Entry' anhängen."""
+    return pascal_name[:-1] if pascal_name.endswith("s") else f"{pascal_name}Entry"
+
+
+def source_version(*paths) -> str:
+    """Hash of the generator source files; part of every input fingerprint."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def input_fingerprint(*inputs) -> str:
+    """Fingerprint of the inputs a generated file is built from.
+
+    Keys are not sorted: control order ends up in the generated code.
+    """
+    data = json.dumps(inputs, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def display_field(controls: dict) -> str:
+    """Which field to show for an entity in dropdowns / table lookups."""
+    for key, ctrl in controls.items():
+        if ctrl.get("fulltype") == "string/text" and ctrl.get("in_list"):
+            return key
+    for name in DISPLAY_FIELD_NAMES:
+        if name in controls:
+            return name
+    for key, ctrl in controls.items():
+        if "string" in ctrl.get("fulltype", ""):
+            return key
+    return next(iter(controls.keys()), "record_id")
+
+
+class SchemaIndex:
+    """Names, relations and display fields of all apps of one metadata dict.
+
+    All dicts are keyed by app identifier. ``relations`` holds the resolved
+    applookup fields of an app (in control order, targets outside the schema
+    are left out), ``unique_relations`` one entry per referenced app.
+    """
+
+    def __init__(self, metadata: dict):
+        self.metadata = metadata
+        self.apps = metadata.get("apps", {})
+
+        self.pascal = {}
+        self.const = {}
+        self.singular = {}
+        self.display_field = {}
+        self.has_date_fields = {}
+        for identifier, data in self.apps.items():
+            controls = data.get("controls", {})
+            self.pascal[identifier] = to_pascal_case(identifier)
+            self.const[identifier] = to_const_name(identifier)
+            self.singular[identifier] = to_singular(self.pascal[identifier])
+            self.display_field[identifier] = display_field(controls)
+            self.has_date_fields[identifier] = any("date" in c.get("fulltype", "") for c in controls.values())
+
+        self.app_id_to_identifier = {data["app_id"]: key for key, data in self.apps.items()}
+
+        self.relations = {}
+        self.unique_relations = {}
+        for identifier, data in self.apps.items():
+            relations = self._resolve_relations(data.get("controls", {}))
+            unique = {}
+            for relation in relations:
+                unique.setdefault(relation["target_identifier"], relation)
+            self.relations[identifier] = relations
+            self.unique_relations[identifier] = list(unique.values())
+
+        self._app_fingerprints = None
+
+    @property
+    def app_fingerprints(self) -> dict:
+        """input_fingerprint of every app's metadata (name, app_id, controls), computed on first use."""
+        if self._app_fingerprints is None:
+            self._app_fingerprints = {identifier: input_fingerprint(data) for identifier, data in self.apps.items()}
+        return self._app_fingerprints
+
+    def _resolve_relations(self, controls: dict) -> list:
+        relations = []
+        for ctrl_key, ctrl_data in controls.items():
+            if "applookup" not in ctrl_data.get("fulltype", ""):
+                continue
+            lookup_app_url = ctrl_data.get("lookup_app", "")
+            if not lookup_app_url or not isinstance(lookup_app_url, str):
+                continue
+            target_app_id = lookup_app_url.rstrip("/").split("/")[-1]
+            target_identifier = self.app_id_to_identifier.get(target_app_id)
+            if target_identifier:
+                relations.append({
+                    "ctrl_key": ctrl_key,
+                    "target_identifier": target_identifier,
+                    "target_pascal": self.pascal[target_identifier],
+                    "target_const": self.const[target_identifier],
+                    "display_field": self.display_field[target_identifier],
+                })
+        return relations
@@ -0,0 +1,198 @@
+"""
+Compact session archive for deploys.
+
+Instead of committing the whole ``.claude`` directory, deploy_to_github
+commits one xz-compressed tar (``.claude_session.tar.xz``) that only holds
+the transcripts needed to resume (current, active and RESUME_SESSION_ID
+session). Older turns are pruned until the archive fits ``max_bytes``:
+long texts, tool results and tool inputs are shortened and images dropped.
+Signed thinking blocks stay unchanged, and no lines are dropped, so the
+message chain stays intact for ``resume``.
+
+The archive is deterministic (sorted members, fixed mtime/owner),
+unchanged sessions produce a byte-identical file.
+"""
+import io
+import json
+import tarfile
+import zlib
+from pathlib import Path
+
+ARCHIVE_NAME = ".claude_session.tar.xz"
+DEFAULT_MAX_BYTES = 2_000_000
+
+# (recent lines kept unchanged, max. characters per text in older lines)
+PRUNE_STEPS = [(None, None), (200, 4000), (50, 1000), (10, 200), (0, 80)]
+
+# zlib level 1 output is at most about this much larger than xz; used to skip
+# prune steps that can't fit without paying for the (slow) xz compression
+ZLIB_TO_XZ_RATIO = 2.0
+
+
+def _session_files(app_dir: Path, session_ids) -> list:
+    """Transcript files (and subagent directories) of the given sessions."""
+    files = []
+    for project_dir in sorted((app_dir / ".claude" / "projects").glob("*")):
+        for session_id in sorted(session_ids):
+            transcript = project_dir / f"{session_id}.jsonl"
+            if transcript.is_file():
+                files.append(transcript)
+            subdir = project_dir / session_id
+            if subdir.is_dir():
+                files.extend(sorted(path for path in subdir.rglob("*") if path.is_file()))
+    return files
+
+
+def session_ids_to_keep(app_dir: Path, resume_session_id: str = None) -> set:
+    """Newest transcript (the running session), .claude_session_id, active session and RESUME_SESSION_ID."""
+    ids = set()
+    transcripts = list((app_dir / ".claude" / "projects").glob("*/*.jsonl"))
+    if transcripts:
+        ids.add(max(transcripts, key=lambda path: path.stat().st_mtime).stem)
+    session_id_file = app_dir / ".claude_session_id"
+    if session_id_file.exists():
+        ids.add(session_id_file.read_text().strip())
+    sessions_file = app_dir / ".claude_sessions.json"
+    if sessions_file.exists():
+        try:
+            ids.add(json.loads(sessions_file.read_text()).get("active_session"))
+        except ValueError:
+            pass
+    if resume_session_id:
+        ids.add(resume_session_id)
+    return {session_id for session_id in ids if session_id}
+
+
+def _shorten_text(text: str, limit: int) -> str:
+    if len(text) > limit:
+        return text[:limit] + f"\n[... {len(text) - limit} Zeichen gekürzt]"
+    return text
+
+
+def _shorten_value(value, limit: int):
+    """Shortens all strings in a JSON structure (tool_use input)."""
+    if isinstance(value, str):
+        return _shorten_text(value, limit)
+    if isinstance(value, list):
+        return [_shorten_value(item, limit) for item in value]
+    if isinstance(value, dict):
+        return {key: _shorten_value(item, limit) for key, item in value.items()}
+    return value
+
+
+def _shorten_content(content, limit: int):
+    """Shortens text, tool_result and tool_use blocks of a message content and drops images.
+
+    All other blocks stay unchanged, especially thinking/redacted_thinking:
+    they are signed, a modified block makes the resumed transcript invalid.
+    """
+    if isinstance(content, str):
+        return _shorten_text(content, limit)
+    if not isinstance(content, list):
+        return content
+    blocks = []
+    for block in content:
+        kind = block.get("type") if isinstance(block, dict) else None
+        if kind == "image":
+            block = {"type": "text", "text": "[Bild entfernt]"}
+        elif kind == "text" and isinstance(block.get("text"), str):
+            block = {**block, "text": _shorten_text(block["text"], limit)}
+        elif kind == "tool_result" and "content" in block:
+            block = {**block, "content": _shorten_content(block["content"], limit)}
+        elif kind == "tool_use" and "input" in block:
+            block = {**block, "input": _shorten_value(block["input"], limit)}
+        blocks.append(block)
+    return blocks
+
+
+def prune_transcript(data: bytes, keep_recent: int, limit: int) -> bytes:
+    """Shortens all but the last ``keep_recent`` lines of a JSONL transcript."""
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    cutoff = max(0, len(lines) - keep_recent)
+    pruned = []
+    for number, line in enumerate(lines):
+        if number < cutoff:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                pruned.append(line)
+                continue
+            if isinstance(entry, dict):
+                # Vollständige Tool-Ergebnisse (nur für die UI), Inhalt steckt auch in message
+                entry.pop("toolUseResult", None)
+                if isinstance(entry.get("message"), dict) and "content" in entry["message"]:
+                    entry["message"]["content"] = _shorten_content(entry["message"]["content"], limit)
+            line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        pruned.append(line)
+    return ("\n".join(pruned) + "\n").encode("utf-8")
+
+
+def _build_archive(members: list) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:xz", preset=6) as tar:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = 0o644
+            info.mtime = 0
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def pack_session(app_dir, resume_session_id: str = None, max_bytes: int = DEFAULT_MAX_BYTES) -> dict:
+    """Writes ``ARCHIVE_NAME`` into ``app_dir``.
+
+    Returns stats: ``sessions``, ``files``, ``raw_bytes``, ``archive_bytes``,
+    ``pruned`` (prune step used, 0 = unchanged) and ``capped`` (still above
+    ``max_bytes`` after the last prune step).
+    """
+    app_dir = Path(app_dir)
+    session_ids = session_ids_to_keep(app_dir, resume_session_id)
+    files = [(path.relative_to(app_dir).as_posix(), path.read_bytes()) for path in _session_files(app_dir, session_ids)]
+
+    archive = b""
+    for step, (keep_recent, limit) in enumerate(PRUNE_STEPS):
+        members = [
+            (name, prune_transcript(data, keep_recent, limit) if limit is not None and name.endswith(".jsonl") else data)
+            for name, data in files
+        ]
+        if step < len(PRUNE_STEPS) - 1:
+            estimate = sum(len(zlib.compress(data, 1)) for _, data in members)
+            if estimate > max_bytes * ZLIB_TO_XZ_RATIO:
+                continue
+        archive = _build_archive(members)
+        if len(archive) <= max_bytes:
+            break
+
+    archive_path = app_dir / ARCHIVE_NAME
+    if not archive_path.exists() or archive_path.read_bytes() != archive:
+        archive_path.write_bytes(archive)
+    return {
+        "sessions": sorted(session_ids),
+        "files": len(files),
+        "raw_bytes": sum(len(data) for _, data in files),
+        "archive_bytes": len(archive),
+        "pruned": step,
+        "capped": len(archive) > max_bytes,
+    }
+
+
+def restore_session(app_dir) -> int:
+    """Extracts the archived transcripts that are missing locally. Returns the number of restored files."""
+    app_dir = Path(app_dir)
+    archive_path = app_dir / ARCHIVE_NAME
+    if not archive_path.exists():
+        return 0
+    restored = 0
+    with tarfile.open(archive_path, mode="r:xz") as tar:
+        for member in tar.getmembers():
+            target = (app_dir / member.name).resolve()
+            # Nur reguläre Dateien unterhalb von .claude/
+            if not member.isfile() or not target.is_relative_to((app_dir / ".claude").resolve()):
+                continue
+            if target.exists():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(tar.extractfile(member).read())
+            restored += 1
+    return restored
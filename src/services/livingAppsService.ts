@@ -30,110 +30,170 @@ async function callApi(method: string, endpoint: string, data?: any) {
   return response.json();
 }
 
+// --- REQUEST CACHE ---
+// GETs pro Endpoint: gleiche Requests, die gerade laufen, werden geteilt,
+// Ergebnisse bleiben CACHE_TTL_MS[App] gültig (0 = nur laufende Requests teilen).
+// create/update/delete invalidieren alle Einträge ihrer App.
+type AppKey = keyof typeof APP_IDS;
+
+const DEFAULT_CACHE_TTL_MS = 30_000;
+// Zur Laufzeit änderbar, z.B. CACHE_TTL_MS.KURSE = 5_000
+export const CACHE_TTL_MS: Record<AppKey, number> = {
+  DOZENTEN: DEFAULT_CACHE_TTL_MS,
+  TEILNEHMER: DEFAULT_CACHE_TTL_MS,
+  RAEUME: DEFAULT_CACHE_TTL_MS,
+  KURSE: DEFAULT_CACHE_TTL_MS,
+  ANMELDUNGEN: DEFAULT_CACHE_TTL_MS,
+};
+
+interface CacheEntry {
+  promise: Promise<any>;
+  expires: number;
+}
+const requestCache = new Map<string, CacheEntry>();
+
+function cachedGet(app: AppKey, endpoint: string): Promise<any> {
+  const cached = requestCache.get(endpoint);
+  if (cached && cached.expires > Date.now()) return cached.promise;
+  // Solange der Request läuft, bekommen alle Aufrufer dasselbe Promise
+  const entry: CacheEntry = { promise: callApi('GET', endpoint), expires: Infinity };
+  requestCache.set(endpoint, entry);
+  entry.promise.then(
+    () => {
+      // Inzwischen invalidiert: Ergebnis nicht cachen
+      if (requestCache.get(endpoint) === entry) entry.expires = Date.now() + CACHE_TTL_MS[app];
+    },
+    () => {
+      if (requestCache.get(endpoint) === entry) requestCache.delete(endpoint);
+    },
+  );
+  return entry.promise;
+}
+
+function invalidateCache(app: AppKey) {
+  const prefix = `/apps/${APP_IDS[app]}/`;
+  for (const endpoint of requestCache.keys()) {
+    if (endpoint.startsWith(prefix)) requestCache.delete(endpoint);
+  }
+}
+
+async function mutateApi(app: AppKey, method: string, endpoint: string, data?: any) {
+  try {
+    return await callApi(method, endpoint, data);
+  } finally {
+    // Auch bei Fehlern: der Stand auf dem Server ist danach unklar
+    invalidateCache(app);
+  }
+}
+
 export class LivingAppsService {
+  static clearCache() {
+    requestCache.clear();
+  }
+
   // --- DOZENTEN ---
   static async getDozenten(): Promise<Dozenten[]> {
-    const data = await callApi('GET', `/apps/${APP_IDS.DOZENTEN}/records`);
+    const data = await cachedGet('DOZENTEN', `/apps/${APP_IDS.DOZENTEN}/records`);
     return Object.entries(data).map(([id, rec]: [string, any]) => ({
       record_id: id, ...rec
     }));
   }
   static async getDozentenEntry(id: string): Promise<Dozenten | undefined> {
-    const data = await callApi('GET', `/apps/${APP_IDS.DOZENTEN}/records/${id}`);
+    const data = await cachedGet('DOZENTEN', `/apps/${APP_IDS.DOZENTEN}/records/${id}`);
     return { record_id: data.id, ...data };
   }
   static async createDozentenEntry(fields: Dozenten['fields']) {
-    return callApi('POST', `/apps/${APP_IDS.DOZENTEN}/records`, { fields });
+    return mutateApi('DOZENTEN', 'POST', `/apps/${APP_IDS.DOZENTEN}/records`, { fields });
   }
   static async updateDozentenEntry(id: string, fields: Partial<Dozenten['fields']>) {
-    return callApi('PATCH', `/apps/${APP_IDS.DOZENTEN}/records/${id}`, { fields });
+    return mutateApi('DOZENTEN', 'PATCH', `/apps/${APP_IDS.DOZENTEN}/records/${id}`, { fields });
   }
   static async deleteDozentenEntry(id: string) {
-    return callApi('DELETE', `/apps/${APP_IDS.DOZENTEN}/records/${id}`);
+    return mutateApi('DOZENTEN', 'DELETE', `/apps/${APP_IDS.DOZENTEN}/records/${id}`);
   }
 
   // --- TEILNEHMER ---
   static async getTeilnehmer(): Promise<Teilnehmer[]> {
-    const data = await callApi('GET', `/apps/${APP_IDS.TEILNEHMER}/records`);
+    const data = await cachedGet('TEILNEHMER', `/apps/${APP_IDS.TEILNEHMER}/records`);
     return Object.entries(data).map(([id, rec]: [string, any]) => ({
       record_id: id, ...rec
     }));
   }
   static async getTeilnehmerEntry(id: string): Promise<Teilnehmer | undefined> {
-    const data = await callApi('GET', `/apps/${APP_IDS.TEILNEHMER}/records/${id}`);
+    const data = await cachedGet('TEILNEHMER', `/apps/${APP_IDS.TEILNEHMER}/records/${id}`);
     return { record_id: data.id, ...data };
   }
   static async createTeilnehmerEntry(fields: Teilnehmer['fields']) {
-    return callApi('POST', `/apps/${APP_IDS.TEILNEHMER}/records`, { fields });
+    return mutateApi('TEILNEHMER', 'POST', `/apps/${APP_IDS.TEILNEHMER}/records`, { fields });
   }
   static async updateTeilnehmerEntry(id: string, fields: Partial<Teilnehmer['fields']>) {
-    return callApi('PATCH', `/apps/${APP_IDS.TEILNEHMER}/records/${id}`, { fields });
+    return mutateApi('TEILNEHMER', 'PATCH', `/apps/${APP_IDS.TEILNEHMER}/records/${id}`, { fields });
   }
   static async deleteTeilnehmerEntry(id: string) {
-    return callApi('DELETE', `/apps/${APP_IDS.TEILNEHMER}/records/${id}`);
+    return mutateApi('TEILNEHMER', 'DELETE', `/apps/${APP_IDS.TEILNEHMER}/records/${id}`);
   }
 
   // --- RAEUME ---
   static async getRaeume(): Promise<Raeume[]> {
-    const data = await callApi('GET', `/apps/${APP_IDS.RAEUME}/records`);
+    const data = await cachedGet('RAEUME', `/apps/${APP_IDS.RAEUME}/records`);
     return Object.entries(data).map(([id, rec]: [string, any]) => ({
       record_id: id, ...rec
     }));
   }
   static async getRaeumeEntry(id: string): Promise<Raeume | undefined> {
-    const data = await callApi('GET', `/apps/${APP_IDS.RAEUME}/records/${id}`);
+    const data = await cachedGet('RAEUME', `/apps/${APP_IDS.RAEUME}/records/${id}`);
     return { record_id: data.id, ...data };
   }
   static async createRaeumeEntry(fields: Raeume['fields']) {
-    return callApi('POST', `/apps/${APP_IDS.RAEUME}/records`, { fields });
+    return mutateApi('RAEUME', 'POST', `/apps/${APP_IDS.RAEUME}/records`, { fields });
   }
   static async updateRaeumeEntry(id: string, fields: Partial<Raeume['fields']>) {
-    return callApi('PATCH', `/apps/${APP_IDS.RAEUME}/records/${id}`, { fields });
+    return mutateApi('RAEUME', 'PATCH', `/apps/${APP_IDS.RAEUME}/records/${id}`, { fields });
   }
   static async deleteRaeumeEntry(id: string) {
-    return callApi('DELETE', `/apps/${APP_IDS.RAEUME}/records/${id}`);
+    return mutateApi('RAEUME', 'DELETE', `/apps/${APP_IDS.RAEUME}/records/${id}`);
   }
 
   // --- KURSE ---
   static async getKurse(): Promise<Kurse[]> {
-    const data = await callApi('GET', `/apps/${APP_IDS.KURSE}/records`);
+    const data = await cachedGet('KURSE', `/apps/${APP_IDS.KURSE}/records`);
     return Object.entries(data).map(([id, rec]: [string, any]) => ({
       record_id: id, ...rec
     }));
   }
   static async getKurseEntry(id: string): Promise<Kurse | undefined> {
-    const data = await callApi('GET', `/apps/${APP_IDS.KURSE}/records/${id}`);
+    const data = await cachedGet('KURSE', `/apps/${APP_IDS.KURSE}/records/${id}`);
     return { record_id: data.id, ...data };
   }
   static async createKurseEntry(fields: Kurse['fields']) {
-    return callApi('POST', `/apps/${APP_IDS.KURSE}/records`, { fields });
+    return mutateApi('KURSE', 'POST', `/apps/${APP_IDS.KURSE}/records`, { fields });
   }
   static async updateKurseEntry(id: string, fields: Partial<Kurse['fields']>) {
-    return callApi('PATCH', `/apps/${APP_IDS.KURSE}/records/${id}`, { fields });
+    return mutateApi('KURSE', 'PATCH', `/apps/${APP_IDS.KURSE}/records/${id}`, { fields });
   }
   static async deleteKurseEntry(id: string) {
-    return callApi('DELETE', `/apps/${APP_IDS.KURSE}/records/${id}`);
+    return mutateApi('KURSE', 'DELETE', `/apps/${APP_IDS.KURSE}/records/${id}`);
   }
 
   // --- ANMELDUNGEN ---
   static async getAnmeldungen(): Promise<Anmeldungen[]> {
-    const data = await callApi('GET', `/apps/${APP_IDS.ANMELDUNGEN}/records`);
+    const data = await cachedGet('ANMELDUNGEN', `/apps/${APP_IDS.ANMELDUNGEN}/records`);
     return Object.entries(data).map(([id, rec]: [string, any]) => ({
       record_id: id, ...rec
     }));
   }
   static async getAnmeldungenEntry(id: string): Promise<Anmeldungen | undefined> {
-    const data = await callApi('GET', `/apps/${APP_IDS.ANMELDUNGEN}/records/${id}`);
+    const data = await cachedGet('ANMELDUNGEN', `/apps/${APP_IDS.ANMELDUNGEN}/records/${id}`);
     return { record_id: data.id, ...data };
   }
   static async createAnmeldungenEntry(fields: Anmeldungen['fields']) {
-    return callApi('POST', `/apps/${APP_IDS.ANMELDUNGEN}/records`, { fields });
+    return mutateApi('ANMELDUNGEN', 'POST', `/apps/${APP_IDS.ANMELDUNGEN}/records`, { fields });
   }
   static async updateAnmeldungenEntry(id: string, fields: Partial<Anmeldungen['fields']>) {
-    return callApi('PATCH', `/apps/${APP_IDS.ANMELDUNGEN}/records/${id}`, { fields });
+    return mutateApi('ANMELDUNGEN', 'PATCH', `/apps/${APP_IDS.ANMELDUNGEN}/records/${id}`, { fields });
   }
   static async deleteAnmeldungenEntry(id: string) {
-    return callApi('DELETE', `/apps/${APP_IDS.ANMELDUNGEN}/records/${id}`);
+    return mutateApi('ANMELDUNGEN', 'DELETE', `/apps/${APP_IDS.ANMELDUNGEN}/records/${id}`);
   }
 
 }
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Startup timing for claude_agent.py.
+
+``StartupTimer.preload`` imports the heavy modules (claude_agent_sdk pulls in
+mcp, pydantic and jsonschema, >1 s) in a background thread, while main()
+reads the prompt and restores the session archive. ``mark`` records the
+phases up to the first ``client.query``, and ``report`` prints them as one
+JSON line:
+
+    {"type": "startup", "total_ms": ..., "budget_ms": ..., "over_budget": false,
+     "phases": {"interpreter": ..., "prompt": ..., ...}, "imports": {"claude_agent_sdk": ..., ...}}
+
+Times are ms since process start (from /proc, so interpreter startup is
+included). For the full import tree run with PYTHONPROFILEIMPORTTIME=1.
+"""
+import importlib
+import json
+import os
+import threading
+import time
+
+
+def _process_start() -> float:
+    """perf_counter() value at process start; the current time where /proc is unavailable."""
+    now = time.perf_counter()
+    try:
+        with open("/proc/self/stat") as f:
+            # Feld 22 (starttime, clock ticks since boot), gezählt nach dem "(comm)"-Feld
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        age = uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return now
+    return now - max(0.0, age)
+
+
+class StartupTimer:
+    def __init__(self, modules: list, budget_ms: float):
+        self.started = _process_start()
+        self.modules = modules
+        self.budget_ms = budget_ms
+        self.phases = {"interpreter": self._elapsed_ms()}
+        # module -> import time in ms (in the preload thread)
+        self.imports = {}
+        self._thread = None
+        self._reported = False
+
+    def _elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 1)
+
+    def _import_all(self):
+        for name in self.modules:
+            t_start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception:
+                # The regular import in main() raises the error
+                continue
+            self.imports[name] = round((time.perf_counter() - t_start) * 1000, 1)
+
+    def preload(self):
+        """Starts importing ``modules`` in a daemon thread (once)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._import_all, name="preload-imports", daemon=True)
+            self._thread.start()
+
+    def wait_imports(self):
+        """Blocks until the preload thread is done; the modules are then in sys.modules."""
+        self.preload()
+        self._thread.join()
+        self.mark("imports")
+
+    def mark(self, phase: str):
+        self.phases[phase] = self._elapsed_ms()
+
+    def report(self):
+        """Prints the startup JSON line once, plus a warning above budget."""
+        if self._reported:
+            return
+        self._reported = True
+        total = self._elapsed_ms()
+        over_budget = total > self.budget_ms
+        print(json.dumps({
+            "type": "startup",
+            "total_ms": total,
+            "budget_ms": self.budget_ms,
+            "over_budget": over_budget,
+            "phases": self.phases,
+            "imports": self.imports,
+        }), flush=True)
+        if over_budget:
+            print(f"[LILO] ⚠️ Startup bis zur ersten Anfrage {total / 1000:.2f}s, Budget {self.budget_ms / 1000:.2f}s")
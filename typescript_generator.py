@@ -1,16 +1,22 @@
-import re
+import schema_index
+from schema_index import SchemaIndex, input_fingerprint, source_version
+
+TYPES_PATH = "src/types/app.ts"
+SERVICE_PATH = "src/services/livingAppsService.ts"
+
+# Code changes invalidate all input fingerprints
+GENERATOR_VERSION = source_version(__file__, schema_index.__file__)
 
 class TypeScriptGenerator:
-    def __init__(self, metadata: dict):
+    def __init__(self, metadata: dict, index: SchemaIndex = None):
         self.metadata = metadata
         self.apps = metadata["apps"]
+        # Namen und App-ID-Zuordnung einmal pro Schema (auch vom ReactComponentGenerator genutzt)
+        self.index = index or SchemaIndex(metadata)
 
-    def _to_pascal_case(self, text: str) -> str:
+    def _to_pascal_case(self, app_key: str) -> str:
         """Macht aus 'workout_logs' -> 'WorkoutLogs'"""
-        # Umlaute ersetzen
-        text = text.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
-        # Alles was kein Buchstabe/Zahl ist zu Space, dann Capitalize
-        return "".join(word.capitalize() for word in re.sub(r"[^a-zA-Z0-9]", " ", text).split())
+        return self.index.pascal[app_key]
 
     def _map_type(self, control: dict) -> str:
         """Wandelt Living Apps Typen in TypeScript Typen um"""
@@ -31,19 +37,57 @@ class TypeScriptGenerator:
         # Fallback für Text, Files, AppLookups (die sind URLs)
         return "string"
 
+    @staticmethod
+    def _join_sections(sections):
+        """Yields the sections (lists of lines) as chunks, concatenated they equal "\n".join(all lines)."""
+        first = True
+        for lines in sections:
+            if not lines:
+                continue
+            yield ("" if first else "\n") + "\n".join(lines)
+            first = False
+
+    def file_inputs(self) -> dict:
+        """{path: input fingerprint} without generating anything.
+
+        app.ts depends on all apps and controls, the service only on the app keys.
+        """
+        return {
+            TYPES_PATH: input_fingerprint(GENERATOR_VERSION, list(self.index.app_fingerprints.items())),
+            SERVICE_PATH: input_fingerprint(GENERATOR_VERSION, list(self.apps)),
+        }
+
+    def iter_files(self, skip=()):
+        """Streams (path, chunk) pairs of app.ts and livingAppsService.ts, one chunk per app.
+
+        Consecutive chunks of one path form one file; writing them as they come
+        keeps memory flat for large schemas. Paths in ``skip`` are not generated.
+        """
+        if TYPES_PATH not in skip:
+            for chunk in self._join_sections(self._type_sections()):
+                yield TYPES_PATH, chunk
+        if SERVICE_PATH not in skip:
+            for chunk in self._join_sections(self._service_sections()):
+                yield SERVICE_PATH, chunk
+
     def generate_types(self) -> str:
         """Erzeugt src/types/app.ts mit Smart Comments für App-Lookups"""
+        return "".join(self._join_sections(self._type_sections()))
+
+    def generate_service(self) -> str:
+        """Erzeugt src/services/livingAppsService.ts (Full Featured)"""
+        return "".join(self._join_sections(self._service_sections()))
+
+    def _type_sections(self):
         lines = ["// AUTOMATICALLY GENERATED TYPES - DO NOT EDIT", ""]
 
-        # 1. Helper Map aufbauen: App ID -> App Name
-        app_id_to_name = {}
-        for key, data in self.apps.items():
-            # Name bereinigen (PascalCase für Kommentar)
-            clean_name = self._to_pascal_case(key)
-            app_id_to_name[data["app_id"]] = clean_name
+        # 1. App ID -> App Name (PascalCase für Kommentar) kommt aus dem SchemaIndex
+        app_id_to_identifier = self.index.app_id_to_identifier
 
         # 2. Interfaces für jede App generieren
         for app_key, app_data in self.apps.items():
+            yield lines
+            lines = []
             interface_name = self._to_pascal_case(app_key)
 
             lines.append(f"export interface {interface_name} {{")
@@ -67,7 +111,8 @@ class TypeScriptGenerator:
                     # Versuche herauszufinden, auf welche App das zeigt
                     try:
                         target_id = ctrl_data["lookup_app"].split("/")[-1]
-                        target_name = app_id_to_name.get(target_id, "UnknownApp")
+                        target = app_id_to_identifier.get(target_id)
+                        target_name = self.index.pascal[target] if target else "UnknownApp"
                         comment = f" // applookup -> URL zu '{target_name}' Record"
                     except:
                         comment = " // applookup -> URL zum Record"
@@ -80,13 +125,12 @@ class TypeScriptGenerator:
             lines.append("")
 
         # 3. App IDs Konstante exportieren
+        yield lines
+        lines = []
         lines.append("export const APP_IDS = {")
         for app_key, app_data in self.apps.items():
             # Konstanten-Name: WORKOUT_LOGS statt WorkoutLogs
-            const_name = app_key.upper().replace("-", "_").replace("&", "").replace(" ", "_")
-            # Doppelte Underscores bereinigen
-            const_name = re.sub(r"_+", "_", const_name)
-
+            const_name = self.index.const[app_key]
             lines.append(f"  {const_name}: '{app_data['app_id']}',")
         lines.append("} as const;")
         lines.append("")
@@ -97,11 +141,9 @@ class TypeScriptGenerator:
             interface_name = self._to_pascal_case(app_key)
             lines.append(f"export type Create{interface_name} = {interface_name}['fields'];")
 
-        return "\n".join(lines)
-
-    def generate_service(self) -> str:
-        """Erzeugt src/services/livingAppsService.ts (Full Featured)"""
+        yield lines
 
+    def _service_sections(self):
         # Header & Helper Functions (Statisch)
         lines = [
             "// AUTOMATICALLY GENERATED SERVICE",
@@ -137,24 +179,83 @@ class TypeScriptGenerator:
             "  return response.json();",
             "}",
             "",
+            "// --- REQUEST CACHE ---",
+            "// GETs pro Endpoint: gleiche Requests, die gerade laufen, werden geteilt,",
+            "// Ergebnisse bleiben CACHE_TTL_MS[App] gültig (0 = nur laufende Requests teilen).",
+            "// create/update/delete invalidieren alle Einträge ihrer App.",
+            "type AppKey = keyof typeof APP_IDS;",
+            "",
+            "const DEFAULT_CACHE_TTL_MS = 30_000;",
+            "// Zur Laufzeit änderbar, z.B. CACHE_TTL_MS.KURSE = 5_000",
+            "export const CACHE_TTL_MS: Record<AppKey, number> = {",
+        ]
+        for app_key in self.apps.keys():
+            lines.append(f"  {self.index.const[app_key]}: DEFAULT_CACHE_TTL_MS,")
+        lines += [
+            "};",
+            "",
+            "interface CacheEntry {",
+            "  promise: Promise<any>;",
+            "  expires: number;",
+            "}",
+            "const requestCache = new Map<string, CacheEntry>();",
+            "",
+            "function cachedGet(app: AppKey, endpoint: string): Promise<any> {",
+            "  const cached = requestCache.get(endpoint);",
+            "  if (cached && cached.expires > Date.now()) return cached.promise;",
+            "  // Solange der Request läuft, bekommen alle Aufrufer dasselbe Promise",
+            "  const entry: CacheEntry = { promise: callApi('GET', endpoint), expires: Infinity };",
+            "  requestCache.set(endpoint, entry);",
+            "  entry.promise.then(",
+            "    () => {",
+            "      // Inzwischen invalidiert: Ergebnis nicht cachen",
+            "      if (requestCache.get(endpoint) === entry) entry.expires = Date.now() + CACHE_TTL_MS[app];",
+            "    },",
+            "    () => {",
+            "      if (requestCache.get(endpoint) === entry) requestCache.delete(endpoint);",
+            "    },",
+            "  );",
+            "  return entry.promise;",
+            "}",
+            "",
+            "function invalidateCache(app: AppKey) {",
+            "  const prefix = `/apps/${APP_IDS[app]}/`;",
+            "  for (const endpoint of requestCache.keys()) {",
+            "    if (endpoint.startsWith(prefix)) requestCache.delete(endpoint);",
+            "  }",
+            "}",
+            "",
+            "async function mutateApi(app: AppKey, method: string, endpoint: string, data?: any) {",
+            "  try {",
+            "    return await callApi(method, endpoint, data);",
+            "  } finally {",
+            "    // Auch bei Fehlern: der Stand auf dem Server ist danach unklar",
+            "    invalidateCache(app);",
+            "  }",
+            "}",
+            "",
             "export class LivingAppsService {",
+            "  static clearCache() {",
+            "    requestCache.clear();",
+            "  }",
+            "",
         ]
 
         # Methoden generieren
         for app_key, app_data in self.apps.items():
+            yield lines
+            lines = []
             class_name = self._to_pascal_case(app_key) # Plural Interface Name (z.B. Workouts)
-            const_name = app_key.upper().replace("-", "_").replace("&", "").replace(" ", "_")
-            const_name = re.sub(r"_+", "_", const_name)
+            const_name = self.index.const[app_key]
 
             # Singular Name für Methoden (z.B. getWorkout statt getWorkoutsEntry)
-            # Einfache Heuristik: Wenn es auf 's' endet, weg damit. Sonst 'Entry' anhängen.
-            singular_name = class_name[:-1] if class_name.endswith("s") else f"{class_name}Entry"
+            singular_name = self.index.singular[app_key]
 
             lines.append(f"  // --- {app_key.upper()} ---")
 
             # GET ALL
             lines.append(f"  static async get{class_name}(): Promise<{class_name}[]> {{")
-            lines.append(f"    const data = await callApi('GET', `/apps/${{APP_IDS.{const_name}}}/records`);")
+            lines.append(f"    const data = await cachedGet('{const_name}', `/apps/${{APP_IDS.{const_name}}}/records`);")
             lines.append("    return Object.entries(data).map(([id, rec]: [string, any]) => ({")
             lines.append("      record_id: id, ...rec")
             lines.append("    }));")
@@ -162,26 +263,26 @@ class TypeScriptGenerator:
 
             # GET ONE
             lines.append(f"  static async get{singular_name}(id: string): Promise<{class_name} | undefined> {{")
-            lines.append(f"    const data = await callApi('GET', `/apps/${{APP_IDS.{const_name}}}/records/${{id}}`);")
+            lines.append(f"    const data = await cachedGet('{const_name}', `/apps/${{APP_IDS.{const_name}}}/records/${{id}}`);")
             lines.append("    return { record_id: data.id, ...data };")
             lines.append("  }")
 
             # CREATE
             lines.append(f"  static async create{singular_name}(fields: {class_name}['fields']) {{")
-            lines.append(f"    return callApi('POST', `/apps/${{APP_IDS.{const_name}}}/records`, {{ fields }});")
+            lines.append(f"    return mutateApi('{const_name}', 'POST', `/apps/${{APP_IDS.{const_name}}}/records`, {{ fields }});")
             lines.append("  }")
 
             # UPDATE
             lines.append(f"  static async update{singular_name}(id: string, fields: Partial<{class_name}['fields']>) {{")
-            lines.append(f"    return callApi('PATCH', `/apps/${{APP_IDS.{const_name}}}/records/${{id}}`, {{ fields }});")
+            lines.append(f"    return mutateApi('{const_name}', 'PATCH', `/apps/${{APP_IDS.{const_name}}}/records/${{id}}`, {{ fields }});")
             lines.append("  }")
 
             # DELETE
             lines.append(f"  static async delete{singular_name}(id: string) {{")
-            lines.append(f"    return callApi('DELETE', `/apps/${{APP_IDS.{const_name}}}/records/${{id}}`);")
+            lines.append(f"    return mutateApi('{const_name}', 'DELETE', `/apps/${{APP_IDS.{const_name}}}/records/${{id}}`);")
             lines.append("  }")
 
             lines.append("")
 
         lines.append("}")
-        return "\n".join(lines)
\ No newline at end of file
+        yield lines
\ No newline at end of file
@@ -1,12 +1,24 @@
 import path from "path"
 import tailwindcss from "@tailwindcss/vite"
-import { defineConfig } from 'vite'
+import { defineConfig, type Plugin } from 'vite'
 import react from '@vitejs/plugin-react'
 
+// Schreibt den Commit-SHA als <meta name="build-fingerprint"> in index.html,
+// damit deploy_to_github erkennt, wann genau dieser Build live ist
+function buildFingerprint(): Plugin {
+  const fingerprint = process.env.BUILD_FINGERPRINT || process.env.GITHUB_SHA || 'dev'
+  return {
+    name: 'build-fingerprint',
+    transformIndexHtml: () => [
+      { tag: 'meta', attrs: { name: 'build-fingerprint', content: fingerprint }, injectTo: 'head' },
+    ],
+  }
+}
+
 // https://vite.dev/config/
 export default defineConfig({ 
   base: 'github/kurs96/',
-  plugins: [react(), tailwindcss()],
+  plugins: [react(), tailwindcss(), buildFingerprint()],
   resolve: {
     alias: {
       "@": path.resolve(__dirname, "./src"),